@@ -0,0 +1,26 @@
+from .models import Application
+
+
+# output column -> attribute path
+APPLICATION_EXPORT_COLUMNS = {
+    "id": "id",
+    "job": "job.id",
+    "job_title": "job.title",
+    "applicant": "applicant.email",
+    "resume": "resume.name",
+    "cover_letter": "cover_letter",
+    "status": "status",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+
+def application_export_queryset():
+    return (
+        Application.objects.select_related("job", "applicant")
+        .only(
+            "id", "resume", "cover_letter", "status", "created_at", "updated_at",
+            "job__id", "job__title", "applicant__email",
+        )
+        .order_by("created_at", "id")
+    )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from common.exports import EXPORT_FORMATS, export_lines, export_rows
+from applications.exports import APPLICATION_EXPORT_COLUMNS, application_export_queryset
+
+
+class Command(BaseCommand):
+    help = "Stream every application to a CSV or JSONL file (or stdout)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--output", help="file to write, defaults to stdout")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        rows = export_rows(application_export_queryset(), APPLICATION_EXPORT_COLUMNS, options["chunk_size"])
+        lines = export_lines(options["format"], list(APPLICATION_EXPORT_COLUMNS), rows)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as out:
+                out.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
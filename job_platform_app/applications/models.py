@@ -32,8 +32,10 @@ class Application(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["job"]),
-            models.Index(fields=["applicant"]),
             models.Index(fields=["status"]),
+            # keyset pagination walks (created_at, id), per applicant for users
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["applicant", "created_at", "id"]),
         ]
 
     def __str__(self):
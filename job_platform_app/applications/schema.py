@@ -1,11 +1,14 @@
 import graphene
-from graphene_django import DjangoObjectType
+from graphene_django import bypass_get_queryset
 from django.shortcuts import get_object_or_404
+from common.connections import keyset_connection
+from common.loaders import load_related
+from common.optimizer import OptimizedDjangoObjectType
 from jobs.models import Job
 
 from .models import Application
 
-class ApplicationType(DjangoObjectType):
+class ApplicationType(OptimizedDjangoObjectType):
     class Meta:
         model = Application
         fields = (
@@ -18,22 +21,46 @@ class ApplicationType(DjangoObjectType):
             "created_at",
         )
 
+    @bypass_get_queryset
+    def resolve_job(self, info):
+        return load_related(info, self, "job")
+
+    @bypass_get_queryset
+    def resolve_applicant(self, info):
+        return load_related(info, self, "applicant")
+
+
+class ApplicationConnection(graphene.relay.Connection):
+    class Meta:
+        node = ApplicationType
+
 
 class ApplicationQuery(graphene.ObjectType):
-    applications = graphene.List(ApplicationType)
+    applications = graphene.List(ApplicationType, deprecation_reason="Unbounded, use applicationsConnection.")
+    # like the REST list: admins see every application, users their own
+    applications_connection = graphene.Field(ApplicationConnection, first=graphene.Int(), after=graphene.String())
     application = graphene.Field(ApplicationType, id=graphene.UUID(required=True))
 
     def resolve_applications(root, info):
         user = info.context.user
         if user.is_anonymous:
             raise Exception("User not logged in!")
-        return Application.objects.select_related("job", "applicant").all()
+        return ApplicationType.get_queryset(Application.objects.all(), info)
+
+    def resolve_applications_connection(root, info, first=None, after=None):
+        user = info.context.user
+        if user.is_anonymous:
+            raise Exception("User not logged in!")
+        queryset = Application.objects.all()
+        if user.role.lower() != "admin":
+            queryset = queryset.filter(applicant=user)
+        return keyset_connection(ApplicationConnection, queryset, info, first, after)
 
     def resolve_application(root, info, id):
         user = info.context.user
         if user.is_anonymous:
             raise Exception("User not logged in!")
-        return Application.objects.get(pk=id)
+        return ApplicationType.get_queryset(Application.objects.all(), info).get(pk=id)
     
 
 class ApplyForJob(graphene.Mutation):
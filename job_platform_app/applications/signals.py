@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from common.cache import bump_generation
+
+from .models import Application
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_cached_reads(sender, **kwargs):
+    bump_generation(sender)
@@ -1,5 +1,6 @@
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -7,9 +8,13 @@ from jobs.models import Job, JobCategory
 from graphene_django.utils.testing import GraphQLTestCase
 from job_platform.schema import schema
 import io
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 
 from .models import Application
+from .serializers import ApplicationSerializer
 
 
 User = get_user_model()
@@ -81,6 +86,38 @@ class ApplicationsAPITest(APITestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertEqual(resp.data.get("status"), "accepted")
 
+    def test_list_applications_with_cursor(self):
+        resume = SimpleUploadedFile("res.pdf", b"content", content_type="application/pdf")
+        application = Application.objects.create(applicant=self.user, job=self.job, resume=resume)
+
+        headers = self.auth_headers("user@example.com", "userpass")
+        resp = self.client.get(reverse("application-list") + "?pagination=cursor", **headers)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([a["id"] for a in resp.data["results"]], [str(application.id)])
+        self.assertIsNone(resp.data["next"])
+
+        # the fast list path renders exactly what the serializer would
+        resp = self.client.get(reverse("application-list"), **headers)
+        expected = ApplicationSerializer([application], many=True, context={"request": resp.wsgi_request}).data
+        self.assertEqual(JSONRenderer().render(resp.data["results"]), JSONRenderer().render(expected))
+
+    def test_export_applications(self):
+        resume = SimpleUploadedFile("res.pdf", b"content", content_type="application/pdf")
+        application = Application.objects.create(applicant=self.user, job=self.job, resume=resume)
+
+        url = reverse("application-export")
+        resp = self.client.get(url, **self.auth_headers("user@example.com", "userpass"))
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+        resp = self.client.get(url, **self.auth_headers("admin@example.com", "adminpass"))
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,job,job_title,applicant,resume,cover_letter,status,created_at,updated_at")
+        self.assertTrue(lines[1].startswith(f"{application.id},{self.job.id},Backend Dev,user@example.com,resumes/"))
+
+        out = io.StringIO()
+        call_command("export_applications", stdout=out)
+        self.assertEqual(out.getvalue().splitlines(), lines)
+
 
 class TestGraphQLAPI(GraphQLTestCase):
     GRAPHQL_SCHEMA = schema
@@ -162,6 +199,41 @@ class TestGraphQLAPI(GraphQLTestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertContains(resp, 'resume')
 
+    def test_application_relations_are_batched(self):
+        token = self.get_token_for("admin@example.com", "adminpass")
+        headers = {"Authorization": f"JWT {token}"}
+        query = "query { applications { id job { title postedBy { email } } applicant { email } } }"
+
+        def apply(count):
+            for i in range(count):
+                applicant = User.objects.create_user(email=f"applicant{Application.objects.count()}@example.com", password="pass")
+                job = Job.objects.create(
+                    title=f"Job {i}", description="desc", company="Acme", location="Remote",
+                    job_type="full-time", category=self.cat, posted_by=self.admin,
+                )
+                Application.objects.create(job=job, applicant=applicant, cover_letter="Hi")
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.query(query, headers=headers)
+            self.assertResponseNoErrors(resp)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(apply(1), apply(5))
+
+    def test_applications_connection_is_scoped_like_the_rest_list(self):
+        other = User.objects.create_user(email="other@example.com", password="pass")
+        own = Application.objects.create(job=self.job, applicant=self.user, cover_letter="Hi")
+        Application.objects.create(job=self.job, applicant=other, cover_letter="Hi")
+        query = "query { applicationsConnection(first: 10) { edges { node { id applicant { email } } } } }"
+
+        def nodes(email, password):
+            token = self.get_token_for(email, password)
+            resp = self.query(query, headers={"Authorization": f"JWT {token}"})
+            self.assertResponseNoErrors(resp)
+            return [edge["node"] for edge in resp.json()["data"]["applicationsConnection"]["edges"]]
+
+        self.assertEqual(nodes("user@example.com", "userpass"), [{"id": str(own.pk), "applicant": {"email": "user@example.com"}}])
+        self.assertEqual(len(nodes("admin@example.com", "adminpass")), 2)
+
     def test_get_application(self):
         token = self.get_token_for("user@example.com", "userpass")
 
@@ -1,10 +1,11 @@
 from django.urls import path
 
-from .views import ApplyToJobView, ApplicationListView, ApplicationDetailView
+from .views import ApplyToJobView, ApplicationListView, ApplicationDetailView, ApplicationExportView
 
 
 urlpatterns = [
     path("", ApplicationListView.as_view(), name="application-list"),
     path("apply/", ApplyToJobView.as_view(), name="apply-to-job"),
+    path("export/", ApplicationExportView.as_view(), name="application-export"),
     path("<uuid:pk>/", ApplicationDetailView.as_view(), name="application-detail"),
 ]
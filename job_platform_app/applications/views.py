@@ -1,11 +1,15 @@
 from rest_framework import generics, response, status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
-from common.permissions import IsOwnerOrAdmin
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from common.permissions import IsAdmin, IsOwnerOrAdmin
+from common.pagination import CursorOrLimitOffsetPagination
+from common.fastpath import FastListMixin
+from common.exports import EXPORT_FORMATS, export_rows, streaming_export_response
 
 from .models import Application
 from .serializers import ApplicationSerializer
 from .permissions import IsApplicantOrAdmin
+from .exports import APPLICATION_EXPORT_COLUMNS, application_export_queryset
 
 
 class ApplyToJobView(generics.CreateAPIView):
@@ -18,9 +22,15 @@ class ApplyToJobView(generics.CreateAPIView):
         serializer.save(applicant=self.request.user)
 
 
-class ApplicationListView(generics.ListAPIView):
+class ApplicationListView(FastListMixin, generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CursorOrLimitOffsetPagination
+    # str(applicant) is the user's email
+    fast_path_sources = {"applicant": "applicant__email"}
+    fast_path_columns = ("created_at",)
+    # cached list counts
+    cache_models = (Application,)
 
     def get_queryset(self):
         user = self.request.user
@@ -29,6 +39,21 @@ class ApplicationListView(generics.ListAPIView):
         return Application.objects.filter(applicant=user).select_related("job")
 
 
+class ApplicationExportView(generics.GenericAPIView):
+    """
+    Stream every application as CSV or JSONL (`?export_format=`, admin only).
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.query_params.get("export_format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({"export_format": [f"Expected one of {', '.join(EXPORT_FORMATS)}."]})
+
+        rows = export_rows(application_export_queryset(), APPLICATION_EXPORT_COLUMNS)
+        return streaming_export_response(fmt, "applications", list(APPLICATION_EXPORT_COLUMNS), rows)
+
+
 class ApplicationDetailView(generics.RetrieveUpdateAPIView):
     queryset = Application.objects.select_related("job", "applicant")
     serializer_class = ApplicationSerializer
@@ -0,0 +1,110 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+
+def _generation_key(model):
+    return f"generation:{model._meta.label_lower}"
+
+
+def get_generations(*models):
+    """
+    Current generation counter of each model. A missing counter (never set
+    or evicted) restarts from the clock, so it can't reuse an old value.
+    """
+    keys = [_generation_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump_generation(model):
+    """
+    Invalidate everything cached against `model`.
+    """
+    key = _generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def make_key(prefix, *parts):
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def normalized_params(query_params):
+    """
+    Query params as a stable tuple: sorted keys, blank values dropped.
+    """
+    return tuple(
+        (key, tuple(v for v in query_params.getlist(key) if v != ""))
+        for key in sorted(query_params.keys())
+        if any(v != "" for v in query_params.getlist(key))
+    )
+
+
+def get_or_compute(key, compute):
+    """
+    Cache a response's data under `key`, with stampede protection: when an
+    entry goes stale one request recomputes it while the others keep
+    serving the stale copy. On a cold miss there is nothing to serve, so
+    the others compute it too rather than tie up a worker waiting.
+    """
+    options = settings.RESPONSE_CACHE
+    entry = cache.get(key)
+    if entry is not None and entry["fresh_until"] > time.time():
+        return Response(entry["data"], headers={"X-Cache": "HIT"})
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, options["LOCK_TIMEOUT"]):
+        try:
+            response = compute()
+            if response.status_code == 200:
+                cache.set(key, {
+                    "data": response.data,
+                    "fresh_until": time.time() + options["TIMEOUT"],
+                }, options["TIMEOUT"] + options["STALE_TIMEOUT"])
+            response["X-Cache"] = "MISS"
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    if entry is not None:
+        return Response(entry["data"], headers={"X-Cache": "STALE"})
+
+    response = compute()
+    response["X-Cache"] = "MISS"
+    return response
+
+
+class CachedReadMixin:
+    """
+    Serve anonymous GETs from the cache. Entries are keyed on the view, URL
+    kwargs, normalized query params and the generation of every model in
+    `cache_models`, so a write to any of them (see the post_save/post_delete
+    receivers bumping the generation) retires all entries at once.
+    """
+    cache_models = ()
+
+    def get(self, request, *args, **kwargs):
+        parent_get = super().get
+        if request.user.is_authenticated:
+            return parent_get(request, *args, **kwargs)
+
+        key = make_key(
+            f"response:{type(self).__name__}",
+            get_generations(*self.cache_models),
+            # paginated responses embed absolute next/previous links
+            request.build_absolute_uri("/"),
+            sorted(kwargs.items()),
+            normalized_params(request.query_params),
+        )
+        return get_or_compute(key, lambda: parent_get(request, *args, **kwargs))
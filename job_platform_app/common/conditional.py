@@ -0,0 +1,92 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+from .cache import get_generations, make_key, normalized_params
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for GET. Detail views build them from the
+    row's own `updated_at` (one small query, none when the validators are
+    cached); lists only get an ETag, made from the generation counters of
+    their `cache_models`, so they cost no query at all. A list view without
+    `cache_models` has nothing to tell a change by and sends no validators.
+    Either way a 304 never touches the serializer.
+
+    `etag_models` lists related models without a timestamp of their own
+    whose generation counter is folded into the ETag (e.g. a nested
+    category name). When the view also uses CachedReadMixin the validators
+    are cached against the same generations.
+    """
+    last_modified_field = "updated_at"
+    etag_models = ()
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators(request, kwargs)
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return response
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def get_validators(self, request, kwargs):
+        cache_models = getattr(self, "cache_models", ())
+        if (self.lookup_url_kwarg or self.lookup_field) not in kwargs:
+            return self.list_validators(request, cache_models)
+        if not cache_models:
+            return self.compute_validators(request, kwargs)
+
+        key = make_key(
+            f"validators:{type(self).__name__}",
+            get_generations(*cache_models),
+            request.accepted_renderer.format,
+            sorted(kwargs.items()),
+            normalized_params(request.query_params),
+        )
+        return cache.get_or_set(
+            key,
+            lambda: self.compute_validators(request, kwargs),
+            settings.RESPONSE_CACHE["TIMEOUT"],
+        )
+
+    def list_validators(self, request, cache_models):
+        if not cache_models:
+            return None
+        # every write to these bumps their generation, see the signals
+        state = get_generations(*dict.fromkeys((*cache_models, *self.etag_models)))
+        return self.make_etag(request, (state, normalized_params(request.query_params))), None
+
+    def compute_validators(self, request, kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = (
+            self.filter_queryset(self.get_queryset()).order_by()
+            .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            .values_list(self.last_modified_field, flat=True)
+            .first()
+        )
+        if row is None:
+            # let the view raise its usual 404
+            return None
+        etag = self.make_etag(request, (
+            (kwargs[lookup_url_kwarg], row),
+            get_generations(*self.etag_models) if self.etag_models else None,
+        ))
+        return etag, int(row.timestamp())
+
+    def make_etag(self, request, state):
+        # JSON and the browsable API share a URL, so they need distinct tags
+        fingerprint = repr((state, request.accepted_renderer.format))
+        return quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
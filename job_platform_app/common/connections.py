@@ -0,0 +1,43 @@
+import graphene
+from django.conf import settings
+
+from .optimizer import plan_connection
+from .pagination import cursor_for, decode_cursor, encode_cursor, keyset_queryset
+
+
+def keyset_connection(connection_type, queryset, info, first=None, after=None):
+    """
+    One page of `queryset` as a relay connection of `connection_type`,
+    newest first on (created_at, id) like the REST cursor pages. `first`
+    defaults to GRAPHQL_PAGE_SIZE and is capped at GRAPHQL_MAX_PAGE_SIZE;
+    `after` is the endCursor of the previous page. Only the columns the
+    nodes' selection needs are loaded.
+    """
+    options = settings.PAGINATION
+    if first is None:
+        first = options["GRAPHQL_PAGE_SIZE"]
+    if first < 0:
+        raise Exception("first must not be negative")
+    first = min(first, options["GRAPHQL_MAX_PAGE_SIZE"])
+
+    try:
+        cursor = decode_cursor(after)._replace(reverse=False) if after else None
+    except ValueError:
+        raise Exception("Invalid cursor")
+
+    plan = plan_connection(info)
+    # the keyset position of each row, for its cursor
+    plan.only.add("created_at")
+    # fetch one extra row to know whether there is another page
+    rows = list(plan.apply(keyset_queryset(queryset, cursor))[:first + 1])
+
+    edges = [connection_type.Edge(node=row, cursor=encode_cursor(cursor_for(row))) for row in rows[:first]]
+    return connection_type(
+        edges=edges,
+        page_info=graphene.relay.PageInfo(
+            has_next_page=len(rows) > first,
+            has_previous_page=cursor is not None,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+    )
@@ -0,0 +1,111 @@
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+
+logger = logging.getLogger(__name__)
+
+# rows per UPDATE statement
+FLUSH_CHUNK_SIZE = 1000
+
+
+class BufferedCounter:
+    """
+    Counts increments of an integer column in process memory and writes
+    them from a background thread every FLUSH_INTERVAL seconds, as one
+    multi-row UPDATE, so counting adds no database writes to requests.
+
+    `setting` names a settings dict with FLUSH_INTERVAL (0 turns the
+    background flush off) and MAX_PENDING (rows buffered before an early
+    flush, and the most kept when a flush fails). Pending counts are
+    flushed at exit; a killed worker loses at most one interval.
+
+    `on_flush(cursor, items)`, if given, runs in the same transaction for
+    each chunk of (pk, amount) pairs, e.g. to feed a rollup.
+    """
+
+    def __init__(self, model, field, setting, on_flush=None):
+        self.model = model
+        self.field = field
+        self.setting = setting
+        self.on_flush = on_flush
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pending = Counter()
+        self.pid = None
+        atexit.register(self.flush)
+
+    @property
+    def options(self):
+        return getattr(settings, self.setting)
+
+    def incr(self, pk, amount=1):
+        with self.lock:
+            if self.pid != os.getpid():
+                # first use in this process, e.g. a freshly forked worker
+                self.pid = os.getpid()
+                self.pending.clear()
+                threading.Thread(target=self._run, name=f"{self.field} flush", daemon=True).start()
+            self.pending[pk] += amount
+            if len(self.pending) >= self.options["MAX_PENDING"]:
+                self.wakeup.set()
+
+    def _run(self):
+        while True:
+            self.wakeup.wait(self.options["FLUSH_INTERVAL"] or 1)
+            self.wakeup.clear()
+            if not self.options["FLUSH_INTERVAL"]:
+                continue
+            try:
+                self.flush()
+            finally:
+                # this thread's own connection, don't hold it between flushes
+                connection.close()
+
+    def flush(self):
+        """
+        Write out the pending counts; returns how many increments were written.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+        if not pending:
+            return 0
+
+        try:
+            self._write(sorted(pending.items()))
+        except DatabaseError:
+            logger.exception("Flushing %s.%s failed", self.model._meta.label, self.field)
+            with self.lock:
+                # retry next time, but don't grow without bound while the database is down
+                for pk, amount in pending.items():
+                    if pk in self.pending or len(self.pending) < self.options["MAX_PENDING"]:
+                        self.pending[pk] += amount
+            return 0
+        return sum(pending.values())
+
+    def _write(self, items):
+        meta = self.model._meta
+        table = connection.ops.quote_name(meta.db_table)
+        column = connection.ops.quote_name(meta.get_field(self.field).column)
+        pk_column = connection.ops.quote_name(meta.pk.column)
+        pk_type = meta.pk.db_type(connection)
+
+        # rows are sorted by pk, so concurrent flushes from other workers
+        # lock them in the same order and can't deadlock
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+                    chunk = items[start:start + FLUSH_CHUNK_SIZE]
+                    values = ", ".join([f"(%s::{pk_type}, %s::bigint)"] * len(chunk))
+                    cursor.execute(
+                        f"UPDATE {table} SET {column} = {table}.{column} + v.amount "
+                        f"FROM (VALUES {values}) AS v(pk, amount) WHERE {table}.{pk_column} = v.pk",
+                        [value for item in chunk for value in item],
+                    )
+                    if self.on_flush is not None:
+                        self.on_flush(cursor, chunk)
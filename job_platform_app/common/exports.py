@@ -0,0 +1,56 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+
+EXPORT_FORMATS = ("csv", "jsonl")
+CONTENT_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+
+class _Echo:
+    # csv.writer target that hands each formatted line back instead of buffering it
+    def write(self, value):
+        return value
+
+
+def _resolve(obj, path):
+    for attr in path.split("."):
+        obj = getattr(obj, attr)
+        if obj is None:
+            return None
+    return obj
+
+
+def export_rows(queryset, columns, chunk_size=2000):
+    """
+    Yield one dict per object, reading `queryset` through a server-side
+    cursor `chunk_size` rows at a time. `columns` maps output names to
+    attribute paths (e.g. "category.slug"), so related objects should be
+    select_related on the queryset.
+    """
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        yield {name: _resolve(obj, path) for name, path in columns.items()}
+
+
+def export_lines(fmt, fields, rows):
+    """
+    Format rows lazily as CSV (with a header line) or JSONL.
+    """
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow([row[field] for field in fields])
+    elif fmt == "jsonl":
+        for row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+    else:
+        raise ValueError(f"Unsupported format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}.")
+
+
+def streaming_export_response(fmt, filename, fields, rows):
+    response = StreamingHttpResponse(export_lines(fmt, fields, rows), content_type=CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
@@ -0,0 +1,204 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PKOnlyObject, RelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class _Unsupported(Exception):
+    pass
+
+
+class ReadPlan:
+    """
+    A serializer compiled down to values() columns plus one converter per
+    output field. `represent(rows, request)` turns values() rows into
+    exactly the dicts the serializer would produce for the instances.
+    """
+
+    def __init__(self, columns, steps):
+        self.columns = columns
+        self.steps = steps
+
+    def represent(self, rows, request):
+        # per-call state, looked up once instead of once per row
+        env = {
+            "request": request,
+            "timezone": timezone.get_current_timezone() if settings.USE_TZ else None,
+        }
+        return [self.to_representation(row, env) for row in rows]
+
+    def to_representation(self, row, env):
+        return {name: convert(row, env) for name, convert in self.steps}
+
+
+def _file_converter(key, field, storage):
+    use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+
+    def convert(row, env):
+        name = row[key]
+        if not name:
+            return None
+        if not use_url:
+            return name
+        url = storage.url(name)
+        request = env["request"]
+        return request.build_absolute_uri(url) if request is not None else url
+    return convert
+
+
+def _datetime_converter(key, field):
+    # DateTimeField.to_representation with the timezone resolved per call;
+    # anything but an aware value in ISO 8601 goes through the field itself
+    if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601 or hasattr(field, "timezone"):
+        return _value_converter(key, field.to_representation)
+
+    def convert(row, env):
+        value = row[key]
+        if value is None or env["timezone"] is None or not timezone.is_aware(value):
+            return None if value is None else field.to_representation(value)
+        value = value.astimezone(env["timezone"]).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+    return convert
+
+
+def _value_converter(key, to_representation):
+    def convert(row, env):
+        value = row[key]
+        return None if value is None else to_representation(value)
+    return convert
+
+
+def _pk_converter(key, to_representation):
+    def convert(row, env):
+        value = row[key]
+        return None if value is None else to_representation(PKOnlyObject(pk=value))
+    return convert
+
+
+def _nested_converter(key, plan):
+    def convert(row, env):
+        if row[key] is None:
+            return None
+        return plan.to_representation(row, env)
+    return convert
+
+
+def _compile(serializer, model, prefix, sources):
+    columns = []
+    steps = []
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if name in sources:
+            key = sources[name]
+            columns.append(key)
+            steps.append((name, _value_converter(key, str)))
+            continue
+
+        if field.source == "*" or "." in field.source:
+            raise _Unsupported(name)
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise _Unsupported(name)
+        if not model_field.concrete:
+            raise _Unsupported(name)
+
+        key = prefix + field.source
+        if isinstance(field, serializers.BaseSerializer):
+            if getattr(field, "many", False):
+                raise _Unsupported(name)
+            nested = _compile(field, model_field.related_model, key + "__", {})
+            columns.append(key)
+            columns.extend(nested.columns)
+            steps.append((name, _nested_converter(key, nested)))
+        elif isinstance(field, RelatedField):
+            if not field.use_pk_only_optimization():
+                raise _Unsupported(name)
+            columns.append(key)
+            steps.append((name, _pk_converter(key, field.to_representation)))
+        elif isinstance(field, serializers.FileField):
+            columns.append(key)
+            steps.append((name, _file_converter(key, field, model_field.storage)))
+        elif isinstance(field, serializers.DateTimeField):
+            columns.append(key)
+            steps.append((name, _datetime_converter(key, field)))
+        else:
+            columns.append(key)
+            steps.append((name, _value_converter(key, field.to_representation)))
+
+    return ReadPlan(columns, steps)
+
+
+# the field set comes from ?fields= / ?omit=, so the memo has to be bounded
+PLAN_CACHE_SIZE = 256
+_plans = OrderedDict()
+_plans_lock = threading.Lock()
+
+
+def compile_read_plan(serializer, sources=None):
+    """
+    Compile (and memoize per serializer class and field set, least
+    recently used first out) a ReadPlan, or return None if some field
+    can't be read from plain rows.
+
+    `sources` maps output fields the compiler can't infer (e.g. a
+    StringRelatedField) to the values() lookup holding their string.
+    """
+    sources = sources or {}
+    key = (type(serializer), tuple(serializer.fields), tuple(sorted(sources.items())))
+    with _plans_lock:
+        if key in _plans:
+            _plans.move_to_end(key)
+            return _plans[key]
+
+    try:
+        plan = _compile(serializer, serializer.Meta.model, "", sources)
+    except _Unsupported:
+        plan = None
+    with _plans_lock:
+        _plans[key] = plan
+        while len(_plans) > PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+    return plan
+
+
+class FastListMixin:
+    """
+    Serve GET lists from values() rows through a compiled ReadPlan instead
+    of instantiating models and running the serializer per object. The
+    output is identical; views fall back to the normal path whenever the
+    serializer has a field the plan can't express.
+
+    `fast_path_sources` feeds compile_read_plan, `fast_path_columns` adds
+    columns the paginator needs (the keyset position).
+    """
+    fast_path_sources = {}
+    fast_path_columns = ()
+
+    def list(self, request, *args, **kwargs):
+        plan = compile_read_plan(self.get_serializer(), self.fast_path_sources)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = {*plan.columns, queryset.model._meta.pk.name, *self.fast_path_columns}
+        queryset = queryset.values(*columns)
+
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else queryset
+        data = plan.represent(rows, request)
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -0,0 +1,47 @@
+from graphql_sync_dataloaders import SyncDataLoader
+
+
+def get_loader(info, key, batch_load_fn):
+    """
+    The SyncDataLoader for `key` in this request, created on first use.
+    Loaders are kept on the request (the GraphQL context), so batching and
+    caching never leak across requests. Needs DeferredExecutionContext,
+    see common.views.
+    """
+    loaders = info.context.__dict__.setdefault("_graphql_loaders", {})
+    if key not in loaders:
+        loaders[key] = SyncDataLoader(batch_load_fn)
+    return loaders[key]
+
+
+def _load_by(model, field):
+    def batch_load(keys):
+        objects = {getattr(obj, field): obj for obj in model._default_manager.filter(**{f"{field}__in": keys})}
+        return [objects.get(key) for key in keys]
+    return batch_load
+
+
+def load_related(info, instance, name):
+    """
+    Resolve the forward or reverse one-to-one / foreign key `name` of
+    `instance` with one batched `IN` query per relation and request level,
+    instead of one query per parent. Objects that already carry the
+    relation (select_related) are returned as is.
+    """
+    field = instance._meta.get_field(name)
+    if field.is_cached(instance):
+        return getattr(instance, name)
+
+    if field.is_relation and field.concrete:
+        # ForeignKey / OneToOneField: look the target up by its key
+        key = getattr(instance, field.attname)
+        model, lookup = field.related_model, field.target_field.attname
+    else:
+        # reverse one-to-one: look the other side up by its foreign key
+        key = instance.pk
+        model, lookup = field.related_model, field.field.attname
+
+    if key is None:
+        return None
+    loader = get_loader(info, (model._meta.label_lower, lookup), _load_by(model, lookup))
+    return loader.load(key)
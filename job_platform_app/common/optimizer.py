@@ -0,0 +1,143 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from graphene.utils.str_converters import to_camel_case
+from graphene_django import DjangoObjectType
+from graphql import FragmentSpreadNode, InlineFragmentNode, get_named_type
+
+
+def _selections(info, selection_set):
+    # field nodes of a selection set, fragments expanded
+    for selection in selection_set.selections:
+        if isinstance(selection, FragmentSpreadNode):
+            yield from _selections(info, info.fragments[selection.name.value].selection_set)
+        elif isinstance(selection, InlineFragmentNode):
+            yield from _selections(info, selection.selection_set)
+        else:
+            yield selection
+
+
+def _model_type(graphql_type):
+    graphene_type = getattr(get_named_type(graphql_type), "graphene_type", None)
+    if graphene_type is None or not issubclass(graphene_type, DjangoObjectType):
+        return None
+    return graphene_type
+
+
+def _prefetched_nodes(info):
+    # ids of the field nodes a parent's plan prefetched in this request
+    return info.context.__dict__.setdefault("_graphql_prefetched", set())
+
+
+class QueryPlan:
+    def __init__(self):
+        self.only = set()
+        self.select_related = []
+        self.prefetch_related = []
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset.only(*self.only)
+
+
+def plan_selection(info, graphql_type, field_nodes, plan=None, prefix=""):
+    """
+    Walk the selection of `field_nodes` (all returning `graphql_type`) and
+    collect the columns, joins and prefetches it needs into a QueryPlan.
+    Forward and reverse one-to-one / foreign keys are joined, many
+    relations prefetched with a queryset planned the same way. Fields that
+    aren't model fields load nothing beyond the primary key.
+    """
+    plan = plan or QueryPlan()
+    named_type = get_named_type(graphql_type)
+    graphene_type = named_type.graphene_type
+    model = graphene_type._meta.model
+    names = {getattr(field, "name", None) or to_camel_case(name): name for name, field in graphene_type._meta.fields.items()}
+    plan.only.add(prefix + model._meta.pk.name)
+
+    for node in (selection for field_node in field_nodes if field_node.selection_set
+                 for selection in _selections(info, field_node.selection_set)):
+        try:
+            field = model._meta.get_field(names.get(node.name.value, ""))
+        except FieldDoesNotExist:
+            continue
+        if not field.is_relation:
+            plan.only.add(prefix + field.name)
+            continue
+
+        if field.concrete and not field.many_to_many:
+            # the key column, needed to join or load the relation
+            plan.only.add(prefix + field.name)
+        related_graphql_type = named_type.fields[node.name.value].type
+        if _model_type(related_graphql_type) is None or node.selection_set is None:
+            continue
+
+        if field.many_to_one or field.one_to_one:
+            path = prefix + field.name
+            plan.select_related.append(path)
+            if not field.concrete:
+                # reverse one-to-one: the related row's own key back to us
+                plan.only.add(f"{path}__{field.field.name}")
+            plan_selection(info, related_graphql_type, [node], plan, f"{path}__")
+        else:
+            related = plan_selection(info, related_graphql_type, [node])
+            if field.one_to_many:
+                # prefetching matches the rows back by their foreign key
+                related.only.add(field.field.name)
+            accessor = field.name if field.concrete else field.get_accessor_name()
+            queryset = related.apply(field.related_model._default_manager.all())
+            plan.prefetch_related.append(Prefetch(prefix + accessor, queryset=queryset))
+            _prefetched_nodes(info).add(id(node))
+    return plan
+
+
+def plan_connection(info):
+    """
+    The QueryPlan for the nodes of a connection field, from its
+    `edges { node { ... } }` selection.
+    """
+    connection_type = get_named_type(info.return_type)
+    edge_type = get_named_type(connection_type.fields["edges"].type)
+    nodes = [
+        node
+        for field_node in info.field_nodes if field_node.selection_set
+        for edges in _selections(info, field_node.selection_set) if edges.name.value == "edges" and edges.selection_set
+        for node in _selections(info, edges.selection_set) if node.name.value == "node"
+    ]
+    return plan_selection(info, edge_type.fields["node"].type, nodes)
+
+
+def optimize(queryset, info):
+    """
+    `queryset` restricted to what the current field's selection asks for:
+    only() the selected columns, select_related() the single relations and
+    prefetch_related() the many ones. Querysets for non-model types are
+    returned unchanged.
+    """
+    if _model_type(info.return_type) is None:
+        return queryset
+    return plan_selection(info, info.return_type, info.field_nodes).apply(queryset)
+
+
+class OptimizedDjangoObjectType(DjangoObjectType):
+    """
+    DjangoObjectType whose get_queryset() applies optimize(); root
+    resolvers pass their querysets through `Type.get_queryset(qs, info)`.
+    Relation resolvers should be @bypass_get_queryset, or graphene-django
+    re-fetches every related object through get_queryset() one by one.
+    Needs a request (or other object) as the GraphQL context, where the
+    plans note which relations they prefetched.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        queryset = super().get_queryset(queryset, info)
+        if any(id(node) in _prefetched_nodes(info) for node in info.field_nodes):
+            # a relation the parent's plan already prefetched
+            return queryset
+        return optimize(queryset, info)
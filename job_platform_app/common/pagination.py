@@ -0,0 +1,308 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+import json
+from urllib import parse
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import get_generations, make_key
+
+
+Cursor = namedtuple("Cursor", ["created_at", "id", "reverse"])
+
+
+def encode_cursor(cursor):
+    """
+    Turn a Cursor into an opaque url-safe token.
+    """
+    tokens = {"t": cursor.created_at.isoformat(), "i": str(cursor.id)}
+    if cursor.reverse:
+        tokens["r"] = "1"
+    querystring = parse.urlencode(tokens)
+    return urlsafe_b64encode(querystring.encode("ascii")).decode("ascii")
+
+
+def decode_cursor(encoded):
+    """
+    Inverse of encode_cursor. Raises ValueError on anything malformed.
+    """
+    try:
+        querystring = urlsafe_b64decode(encoded.encode("ascii")).decode("ascii")
+    except (TypeError, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    tokens = parse.parse_qs(querystring)
+    created_at = parse_datetime(tokens.get("t", [""])[0])
+    if created_at is None:
+        raise ValueError("Invalid cursor")
+
+    pk = uuid.UUID(tokens.get("i", [""])[0])
+    reverse = tokens.get("r", ["0"])[0] == "1"
+    return Cursor(created_at=created_at, id=pk, reverse=reverse)
+
+
+def cursor_for(item, reverse=False):
+    """
+    Build a Cursor pointing at a model instance or a values() row.
+    """
+    if isinstance(item, dict):
+        return Cursor(created_at=item["created_at"], id=item["id"], reverse=reverse)
+    return Cursor(created_at=item.created_at, id=item.pk, reverse=reverse)
+
+
+def keyset_queryset(queryset, cursor=None):
+    """
+    Order a queryset newest first on (created_at, id) and, given a cursor,
+    keep only the rows after it (or before it when the cursor is reversed).
+
+    The redundant created_at bound gives the planner an index range on the
+    (created_at, id) index instead of an OR it can't use.
+    """
+    if cursor is None:
+        return queryset.order_by("-created_at", "-id")
+
+    if cursor.reverse:
+        return queryset.filter(
+            Q(created_at__gte=cursor.created_at),
+            Q(created_at__gt=cursor.created_at) | Q(id__gt=cursor.id),
+        ).order_by("created_at", "id")
+
+    return queryset.filter(
+        Q(created_at__lte=cursor.created_at),
+        Q(created_at__lt=cursor.created_at) | Q(id__lt=cursor.id),
+    ).order_by("-created_at", "-id")
+
+
+def pk_batches(queryset, batch_size):
+    """
+    Yield the primary keys of a queryset in ascending lists of up to
+    `batch_size`, each one a `pk > last` seek rather than an offset, so
+    walking a whole table stays cheap to the end.
+    """
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    last_pk = None
+    while True:
+        batch = list((pks if last_pk is None else pks.filter(pk__gt=last_pk))[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1]
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Opaque cursor pagination on (created_at, id), newest first. Unlike
+    limit/offset, the cost of a page doesn't grow with how deep it is.
+
+    http://api.example.org/jobs/?pagination=cursor&limit=50
+    http://api.example.org/jobs/?cursor=dD0yMDI1LTExLTE3...
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    template = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        try:
+            self.cursor = decode_cursor(encoded) if encoded else None
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+        # fetch one extra row to know whether there is another page
+        results = list(keyset_queryset(queryset, self.cursor)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if self.cursor is not None and self.cursor.reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        cursor = cursor_for(self.page[-1])
+        return replace_query_param(self.base_url, self.cursor_query_param, encode_cursor(cursor))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        cursor = cursor_for(self.page[0], reverse=True)
+        return replace_query_param(self.base_url, self.cursor_query_param, encode_cursor(cursor))
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+def estimated_count(queryset):
+    """
+    The planner's row estimate for a queryset: EXPLAIN only, nothing runs.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cached_count(queryset, models):
+    """
+    Exact count, cached against the query itself and the generation of
+    `models`, so any write to them retires it.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    key = make_key(f"count:{queryset.model._meta.label_lower}", get_generations(*models), sql, params)
+    return cache.get_or_set(key, queryset.count, settings.PAGINATION["COUNT_CACHE_TIMEOUT"])
+
+
+class CountingLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Limit/offset without a COUNT(*) per page:
+
+    - `?count=false` skips the count (`count` is null);
+    - when the planner expects more than COUNT_ESTIMATE_THRESHOLD rows its
+      estimate is returned instead, flagged with `"count_estimated": true`;
+    - otherwise the exact count is cached against the generation of the
+      view's `cache_models` (just computed when the view has none).
+
+    Whether there is a next page comes from fetching one extra row, so
+    links stay right even when the count is skipped or estimated.
+    """
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+
+        self.count_estimated = False
+        self.count = self.get_count_for(queryset, request, view)
+
+        results = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        results = results[:self.limit]
+
+        if self.count is not None and self.template is not None and self.count > self.limit:
+            self.display_page_controls = True
+        return results
+
+    def get_count_for(self, queryset, request, view):
+        if request.query_params.get(self.count_query_param, "").lower() in ("false", "0", "no"):
+            return None
+
+        if not hasattr(queryset, "query"):
+            return self.get_count(queryset)
+
+        threshold = settings.PAGINATION["COUNT_ESTIMATE_THRESHOLD"]
+        if threshold is not None:
+            estimate = estimated_count(queryset)
+            if estimate > threshold:
+                self.count_estimated = True
+                return estimate
+
+        models = getattr(view, "cache_models", ())
+        if models:
+            return cached_count(queryset, models)
+        return self.get_count(queryset)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count_estimated:
+            response.data["count_estimated"] = True
+        return response
+
+    def get_html_context(self):
+        if self.count is None:
+            return {"previous_url": self.get_previous_link(), "next_url": self.get_next_link(), "page_links": []}
+        return super().get_html_context()
+
+
+class CursorOrLimitOffsetPagination(CountingLimitOffsetPagination):
+    """
+    Limit/offset by default so existing clients keep working. Passing
+    `?pagination=cursor` (or any `?cursor=`) switches to keyset pagination.
+    """
+    mode_query_param = "pagination"
+    cursor_pagination_class = KeysetCursorPagination
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_pagination_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return ""
+        return super().to_html()
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLError, parse, specified_rules, validate
+
+
+class DocumentCache:
+    """
+    Per-process LRU of parsed documents that passed the standard
+    validation rules, keyed by the SHA-256 of their query text.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.documents = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            document = self.documents.get(key)
+            if document is not None:
+                self.documents.move_to_end(key)
+            return document
+
+    def put(self, key, document):
+        with self.lock:
+            self.documents[key] = document
+            self.documents.move_to_end(key)
+            while len(self.documents) > settings.PERSISTED_QUERIES["VALIDATION_CACHE_SIZE"]:
+                self.documents.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.documents.clear()
+
+
+document_cache = DocumentCache()
+
+
+def query_hash(query):
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+def persisted_hash(extensions):
+    """
+    The sha256Hash of an Apollo-style `persistedQuery` extension (a dict,
+    or JSON text on GET), or None.
+    """
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+    if not isinstance(extensions, dict):
+        return None
+    persisted = extensions.get("persistedQuery")
+    if not isinstance(persisted, dict) or persisted.get("version") != 1:
+        return None
+    sha256 = persisted.get("sha256Hash")
+    return sha256.lower() if isinstance(sha256, str) else None
+
+
+def _query_key(sha256):
+    return f"persisted-query:{sha256}"
+
+
+def resolve_query(query, sha256):
+    """
+    The query text to run: `query` itself once checked against `sha256`,
+    or the text registered under `sha256` when the client sent only the
+    hash. Raises GraphQLError on a mismatch or an unknown hash (the client
+    then retries with the text).
+    """
+    if query:
+        if query_hash(query) != sha256:
+            raise GraphQLError("provided sha does not match query", extensions={"code": "INVALID_PERSISTED_QUERY"})
+        return query
+    query = cache.get(_query_key(sha256))
+    if query is None:
+        raise GraphQLError("PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"})
+    return query
+
+
+def register_query(sha256, query):
+    # shared cache, so any worker can serve the hash afterwards; add() leaves
+    # a hash that's already registered alone
+    cache.add(_query_key(sha256), query, settings.PERSISTED_QUERIES["QUERY_TIMEOUT"])
+
+
+def get_document(schema, query):
+    """
+    (document, errors) for `query`: parsed and checked against the
+    standard validation rules once per process, then served from the LRU
+    without parsing again. Invalid documents aren't cached.
+    """
+    key = query_hash(query)
+    document = document_cache.get(key)
+    if document is not None:
+        return document, []
+
+    try:
+        document = parse(query)
+    except GraphQLError as error:
+        return None, [error]
+    errors = validate(schema, document, specified_rules)
+    if errors:
+        return None, errors
+    document_cache.put(key, document)
+    return document, []
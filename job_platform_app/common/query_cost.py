@@ -0,0 +1,133 @@
+from django.conf import settings
+from graphql import (
+    FieldNode, FragmentSpreadNode, GraphQLError, GraphQLList, InlineFragmentNode, IntValueNode, OperationType,
+    VariableNode, get_named_type, get_nullable_type, is_composite_type,
+)
+from graphql.validation import ValidationRule
+
+
+# arguments that bound how many items a field returns
+SIZE_ARGUMENTS = ("first", "limit")
+
+
+def limits_for(user):
+    """
+    (max depth, max cost) for the user's role; logged-out clients get the
+    "anonymous" limits, unknown roles the "user" ones.
+    """
+    limits = settings.GRAPHQL_COST["LIMITS"]
+    role = "anonymous" if user.is_anonymous else (user.role or "user").lower()
+    role_limits = limits.get(role, limits["user"])
+    return role_limits["MAX_DEPTH"], role_limits["MAX_COST"]
+
+
+def _size(node, variables):
+    for argument in node.arguments:
+        if argument.name.value not in SIZE_ARGUMENTS:
+            continue
+        value = argument.value
+        if isinstance(value, VariableNode):
+            value = variables.get(value.name.value)
+        elif isinstance(value, IntValueNode):
+            value = int(value.value)
+        if isinstance(value, int) and value >= 0:
+            return value
+    return None
+
+
+class CostAnalysis:
+    """
+    Static depth and cost of a query, before anything runs.
+
+    Every object costs 1 plus its selection, scalars cost nothing, and a
+    list field is charged that per item for its size: its `first`/`limit`
+    argument, the one of the connection field right above it (`edges`),
+    or DEFAULT_LIST_SIZE. Fields in FIELD_COSTS add their cost once per
+    resolution on top. Introspection is free.
+    """
+
+    def __init__(self, context, variables=None):
+        self.context = context
+        self.schema = context.schema
+        self.variables = variables or {}
+        self.options = settings.GRAPHQL_COST
+
+    def measure(self, operation):
+        root_type = {
+            OperationType.QUERY: self.schema.query_type,
+            OperationType.MUTATION: self.schema.mutation_type,
+            OperationType.SUBSCRIPTION: self.schema.subscription_type,
+        }[operation.operation]
+        if root_type is None:
+            return 0, 0
+        return self._selection(operation.selection_set, root_type, None, frozenset())
+
+    def _selection(self, selection_set, parent_type, page_size, fragments):
+        # (depth, cost) of a selection set on parent_type
+        depth = cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                field_depth, field_cost = self._field(selection, parent_type, page_size, fragments)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.context.get_fragment(name)
+                if fragment is None or name in fragments:
+                    # unknown or cyclic, reported by the standard rules
+                    continue
+                field_depth, field_cost = self._selection(
+                    fragment.selection_set, self.schema.get_type(fragment.type_condition.name.value) or parent_type,
+                    page_size, fragments | {name},
+                )
+            elif isinstance(selection, InlineFragmentNode):
+                condition = selection.type_condition
+                field_depth, field_cost = self._selection(
+                    selection.selection_set, self.schema.get_type(condition.name.value) if condition else parent_type,
+                    page_size, fragments,
+                )
+            else:
+                continue
+            depth = max(depth, field_depth)
+            cost += field_cost
+        return depth, cost
+
+    def _field(self, node, parent_type, page_size, fragments):
+        name = node.name.value
+        definition = getattr(parent_type, "fields", {}).get(name)
+        if name.startswith("__") or definition is None:
+            return 0, 0
+
+        field_type = definition.type
+        is_list = isinstance(get_nullable_type(field_type), GraphQLList)
+        size = _size(node, self.variables)
+
+        child_depth = child_cost = 0
+        if node.selection_set is not None:
+            child_depth, child_cost = self._selection(
+                node.selection_set, get_named_type(field_type),
+                # a connection's size applies to the list right below it
+                None if is_list else size, fragments,
+            )
+
+        item_cost = (1 if is_composite_type(get_named_type(field_type)) else 0) + child_cost
+        if is_list:
+            item_cost *= next(s for s in (size, page_size, self.options["DEFAULT_LIST_SIZE"]) if s is not None)
+        return child_depth + 1, self.options["FIELD_COSTS"].get(f"{parent_type.name}.{name}", 0) + item_cost
+
+
+def query_cost_rule(max_depth, max_cost, variables, on_measured):
+    """
+    A validation rule rejecting operations deeper than `max_depth` or
+    costlier than `max_cost`, so they fail before any resolver runs.
+    `on_measured(depth, cost)` gets the figures of every operation.
+    """
+
+    class QueryCostRule(ValidationRule):
+        def enter_operation_definition(self, node, *_args):
+            depth, cost = CostAnalysis(self.context, variables).measure(node)
+            on_measured(depth, cost)
+            if depth > max_depth:
+                self.report_error(GraphQLError(f"Query depth {depth} exceeds the maximum of {max_depth}.", node))
+            if cost > max_cost:
+                self.report_error(GraphQLError(f"Query cost {cost} exceeds the maximum of {max_cost}.", node))
+
+    return QueryCostRule
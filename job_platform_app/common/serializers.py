@@ -0,0 +1,58 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def _param_set(request, name):
+    value = request.query_params.get(name, "")
+    return {part.strip() for part in value.split(",") if part.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Let GET requests trim the representation with `?fields=a,b` (keep only
+    these) and/or `?omit=c` (drop these). Unknown names are ignored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+
+        keep = _param_set(request, "fields")
+        omit = _param_set(request, "omit")
+        for name in list(self.fields):
+            if (keep and name not in keep) or name in omit:
+                self.fields.pop(name)
+
+
+def load_only_serialized(queryset, serializer, extra=()):
+    """
+    Restrict a queryset to the columns `serializer` actually reads:
+    only() on its model fields, select_related() for nested serializers.
+    `extra` adds columns needed outside the serializer (e.g. for ordering).
+    """
+    model = queryset.model
+    columns = set(extra)
+    related = []
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+        name = field.source.split(".")[0]
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.concrete:
+            continue
+
+        columns.add(name)
+        if model_field.is_relation and isinstance(field, serializers.BaseSerializer):
+            related.append(name)
+
+    queryset = queryset.select_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
@@ -1,3 +1,243 @@
-from django.test import TestCase
+import json
+import time
+from unittest import mock
 
-# Create your tests here.
+import graphene
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from graphene_django.registry import Registry
+from graphql import parse, validate
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.response import Response
+
+from jobs.models import Job, JobCategory
+
+from .cache import get_or_compute
+from .optimizer import OptimizedDjangoObjectType
+from .pagination import pk_batches
+from .persisted_queries import document_cache, query_hash
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return Response({"calls": self.calls})
+
+    def test_stale_entry_served_while_another_request_refreshes(self):
+        cache.set("k", {"data": {"calls": 0}, "fresh_until": time.time() - 1}, 60)
+
+        # another worker holds the refresh lock
+        cache.add("k:lock", 1, 10)
+        resp = get_or_compute("k", self.compute)
+        self.assertEqual(resp.data, {"calls": 0})
+        self.assertEqual(resp["X-Cache"], "STALE")
+        self.assertEqual(self.calls, 0)
+
+        # once the lock is released the next request refreshes it
+        cache.delete("k:lock")
+        resp = get_or_compute("k", self.compute)
+        self.assertEqual(resp.data, {"calls": 1})
+        resp = get_or_compute("k", self.compute)
+        self.assertEqual(resp["X-Cache"], "HIT")
+        self.assertEqual(self.calls, 1)
+
+    def test_cold_miss_computes_instead_of_waiting_for_the_lock(self):
+        cache.add("k:lock", 1, 10)
+        started = time.monotonic()
+        resp = get_or_compute("k", self.compute)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(resp.data, {"calls": 1})
+        self.assertEqual(resp["X-Cache"], "MISS")
+
+
+class PkBatchesTest(TestCase):
+    def test_walks_every_row_once_in_order(self):
+        categories = [JobCategory.objects.create(name=f"Category {i}", slug=f"category-{i}") for i in range(5)]
+        batches = list(pk_batches(JobCategory.objects.all(), 2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual([pk for batch in batches for pk in batch], sorted(c.pk for c in categories))
+
+
+# own registry, so these types don't replace the real schema's
+optimizer_registry = Registry()
+
+
+class JobCard(OptimizedDjangoObjectType):
+    class Meta:
+        model = Job
+        fields = ("id", "title")
+        registry = optimizer_registry
+
+
+class CategoryWithJobs(OptimizedDjangoObjectType):
+    class Meta:
+        model = JobCategory
+        fields = ("id", "name", "jobs")
+        registry = optimizer_registry
+
+
+class OptimizerQuery(graphene.ObjectType):
+    categories = graphene.List(CategoryWithJobs)
+
+    def resolve_categories(root, info):
+        return CategoryWithJobs.get_queryset(JobCategory.objects.order_by("name"), info)
+
+
+class QueryOptimizerTest(TestCase):
+    def test_many_relations_are_prefetched_with_their_selection(self):
+        admin = get_user_model().objects.create_user(email="admin@example.com", password="pass", role="admin")
+        for name in ("Design", "Tech"):
+            category = JobCategory.objects.create(name=name, slug=name.lower())
+            for i in range(3):
+                Job.objects.create(
+                    title=f"{name} {i}", description="desc", company="Acme", location="Remote",
+                    job_type="full-time", category=category, posted_by=admin,
+                )
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = graphene.Schema(query=OptimizerQuery).execute(
+                "{ categories { name jobs { title } } }", context_value=RequestFactory().get("/graphql/"),
+            )
+        self.assertIsNone(result.errors)
+        self.assertEqual([len(c["jobs"]) for c in result.data["categories"]], [3, 3])
+
+        categories, jobs = [q["sql"] for q in ctx.captured_queries]
+        self.assertNotIn('"jobs_jobcategory"."slug"', categories)
+        self.assertIn('"jobs_job"."category_id"', jobs)
+        self.assertIn('"jobs_job"."title"', jobs)
+        self.assertNotIn('"jobs_job"."description"', jobs)
+
+
+class GraphQLCostLimitTest(APITestCase):
+    def setUp(self):
+        get_user_model().objects.create_user(email="user@example.com", password="userpass", role="user")
+        resp = self.client.post("/graphql/", {
+            "query": 'mutation { tokenAuth(email: "user@example.com", password: "userpass") { token } }'
+        }, format="json")
+        self.token = resp.json()["data"]["tokenAuth"]["token"]
+
+    def graphql(self, query, variables=None, token=True):
+        headers = {"HTTP_AUTHORIZATION": f"JWT {self.token}"} if token else {}
+        return self.client.post("/graphql/", {"query": query, "variables": variables}, format="json", **headers)
+
+    def test_cost_is_reported_per_role(self):
+        resp = self.graphql("{ jobs { id title } }")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["extensions"]["cost"], {"requested": 100, "maximum": 5000, "depth": 2, "maxDepth": 8})
+
+        # connections are charged for their page size
+        query = "query page($first: Int) { jobsConnection(first: $first) { edges { node { id category { name } } } } }"
+        cost = self.graphql(query, {"first": 10}).json()["extensions"]["cost"]
+        self.assertEqual(cost["requested"], 1 + 10 * (1 + 1 + 1))
+
+        resp = self.graphql("{ categories { id } }", token=False)
+        self.assertEqual(resp.json()["extensions"]["cost"]["maximum"], 500)
+
+    @override_settings(GRAPHQL_COST={
+        "LIMITS": {"anonymous": {"MAX_DEPTH": 2, "MAX_COST": 10}, "user": {"MAX_DEPTH": 3, "MAX_COST": 250}},
+        "DEFAULT_LIST_SIZE": 100,
+        "FIELD_COSTS": {},
+    })
+    def test_expensive_queries_are_rejected_before_resolving(self):
+        self.assertEqual(self.graphql("{ jobs { category { name } } }").status_code, status.HTTP_200_OK)
+
+        for query, error in (
+            ("{ jobs { postedBy { profile { bio } } } }", "Query depth 4 exceeds the maximum of 3."),
+            (
+                "{ jobs { ...card } } fragment card on JobType { category { id } postedBy { id } }",
+                "Query cost 300 exceeds the maximum of 250.",
+            ),
+        ):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.graphql(query)
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(resp.json()["errors"][0]["message"], error)
+            # no resolver ran
+            self.assertFalse([q for q in ctx.captured_queries if "jobs_job" in q["sql"]])
+
+
+class PersistedQueryTest(APITestCase):
+    query = "query categories { categories { id name } }"
+
+    def setUp(self):
+        cache.clear()
+        document_cache.clear()
+        get_user_model().objects.create_user(email="user@example.com", password="userpass", role="user")
+        resp = self.client.post("/graphql/", {
+            "query": 'mutation { tokenAuth(email: "user@example.com", password: "userpass") { token } }'
+        }, format="json")
+        self.headers = {"HTTP_AUTHORIZATION": f"JWT {resp.json()['data']['tokenAuth']['token']}"}
+        JobCategory.objects.create(name="Tech", slug="tech")
+        self.extensions = {"persistedQuery": {"version": 1, "sha256Hash": query_hash(self.query)}}
+
+    def test_hash_is_registered_then_served_by_get(self):
+        # unknown hash without the text: the client retries with it
+        resp = self.client.post("/graphql/", {"extensions": self.extensions}, format="json", **self.headers)
+        self.assertEqual(resp.json()["errors"][0]["message"], "PersistedQueryNotFound")
+
+        resp = self.client.post(
+            "/graphql/", {"query": self.query, "extensions": self.extensions}, format="json", **self.headers
+        )
+        self.assertEqual(resp.json()["data"]["categories"][0]["name"], "Tech")
+
+        resp = self.client.get("/graphql/", {"extensions": json.dumps(self.extensions)}, **self.headers)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["data"]["categories"][0]["name"], "Tech")
+        self.assertIn("private", resp["Cache-Control"])
+        self.assertIn("max-age=60", resp["Cache-Control"])
+        self.assertIn("Authorization", resp["Vary"])
+
+    def test_hash_must_match_the_text(self):
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": query_hash("{ users { id } }")}}
+        resp = self.client.post("/graphql/", {"query": self.query, "extensions": extensions}, format="json", **self.headers)
+        self.assertEqual(resp.json()["errors"][0]["message"], "provided sha does not match query")
+
+    def test_mutations_are_not_run_from_get(self):
+        mutation = 'mutation { createCategory(name: "Design") { category { id } } }'
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": query_hash(mutation)}}
+        self.client.post("/graphql/", {"query": mutation, "extensions": extensions}, format="json", **self.headers)
+        resp = self.client.get("/graphql/", {"extensions": json.dumps(extensions)}, **self.headers)
+        self.assertEqual(resp.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        # a mutation sent over GET with its text is refused before being registered
+        other = 'mutation { createCategory(name: "Sales") { category { id } } }'
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": query_hash(other)}}
+        resp = self.client.get("/graphql/", {"query": other, "extensions": json.dumps(extensions)}, **self.headers)
+        self.assertEqual(resp.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertIsNone(cache.get(f"persisted-query:{query_hash(other)}"))
+
+    def test_documents_are_parsed_and_validated_once(self):
+        with mock.patch("common.persisted_queries.parse", wraps=parse) as parse_mock, \
+                mock.patch("graphene_django.views.parse", wraps=parse) as view_parse_mock, \
+                mock.patch("common.persisted_queries.validate", wraps=validate) as validate_mock:
+            for _ in range(3):
+                resp = self.client.post("/graphql/", {"query": self.query}, format="json", **self.headers)
+                self.assertEqual(resp.json()["data"]["categories"][0]["name"], "Tech")
+            # hash-only requests reuse the same document
+            self.client.post("/graphql/", {"query": self.query, "extensions": self.extensions}, format="json", **self.headers)
+            for _ in range(2):
+                resp = self.client.get("/graphql/", {"extensions": json.dumps(self.extensions)}, **self.headers)
+                self.assertEqual(resp.json()["data"]["categories"][0]["name"], "Tech")
+        # graphene-django's own parse never runs
+        self.assertEqual((parse_mock.call_count, view_parse_mock.call_count, validate_mock.call_count), (1, 0, 1))
+
+        # and invalid queries are reported, never remembered
+        for _ in range(2):
+            resp = self.client.post("/graphql/", {"query": "{ categories { nope } }"}, format="json", **self.headers)
+            self.assertIn("nope", resp.json()["errors"][0]["message"])
+
+    def test_known_hashes_are_not_registered_again(self):
+        payload = {"query": self.query, "extensions": self.extensions}
+        with mock.patch("common.persisted_queries.cache.add", wraps=cache.add) as add_mock:
+            self.client.post("/graphql/", payload, format="json", **self.headers)
+            self.client.get("/graphql/", {"extensions": json.dumps(self.extensions)}, **self.headers)
+        # only the request carrying the text registers it
+        self.assertEqual(add_mock.call_count, 1)
@@ -1,8 +1,37 @@
-from graphene_django.views import GraphQLView
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.views import GraphQLView, HttpError
+from django.conf import settings
+from django.contrib.auth import authenticate
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import connection, transaction
+from django.http import HttpResponseNotAllowed
+from django.http.response import HttpResponseBadRequest
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from graphql import ExecutionResult, GraphQLError, OperationType, execute, get_operation_ast, validate
+from graphql_jwt.exceptions import JSONWebTokenError
+from graphql_jwt.utils import get_http_authorization
+from graphql_sync_dataloaders import DeferredExecutionContext
+
+from .persisted_queries import get_document, persisted_hash, register_query, resolve_query
+from .query_cost import limits_for, query_cost_rule
 
 
 class DjangoContextGraphQLView(GraphQLView):
+    # lets the dataloaders in common.loaders batch each level of the query
+    execution_context_class = DeferredExecutionContext
+
+    def dispatch(self, request, *args, **kwargs):
+        self.query_cost = None
+        self.persisted_hash = None
+        self.cacheable = False
+        response = super().dispatch(request, *args, **kwargs)
+        if self.cacheable:
+            # GET by hash: the URL identifies the query, so HTTP caches can keep it
+            patch_cache_control(response, private=True, max_age=settings.PERSISTED_QUERIES["MAX_AGE"])
+            patch_vary_headers(response, ["Authorization"])
+        return response
+
     def get_context(self, request):
         # return the actual Django request, not a wrapper
         return request
@@ -13,8 +42,103 @@ class DjangoContextGraphQLView(GraphQLView):
         auth_header = request.headers.get("Authorization")
         if auth_header:
             request.META["HTTP_AUTHORIZATION"] = auth_header
+        self.persisted_hash = persisted_hash(request.GET.get("extensions") or data.get("extensions"))
         return params
 
+    def authenticate(self, request):
+        # the JWT middleware only runs with the resolvers, but the cost
+        # limits are checked before them; a bad token stays anonymous here
+        # and fails in the middleware as before
+        if request.user.is_anonymous and get_http_authorization(request) is not None:
+            try:
+                user = authenticate(request=request)
+            except JSONWebTokenError:
+                user = None
+            if user is not None:
+                request.user = user
+        return request.user
+
+    def execute_graphql_request(self, request, data, query, variables, operation_name, show_graphiql=False):
+        """
+        GraphQLView's flow on a cached document: persisted hashes resolved,
+        the document parsed and checked against the standard rules once per
+        process (see common.persisted_queries), and only the per-role cost
+        rule validated on every request.
+        """
+        sent_text = bool(query)
+        if self.persisted_hash:
+            try:
+                query = resolve_query(query, self.persisted_hash)
+            except GraphQLError as error:
+                return ExecutionResult(data=None, errors=[error])
+        if not query:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseBadRequest("Must provide query string."))
+
+        schema = self.schema.graphql_schema
+        document, errors = get_document(schema, query)
+        if errors:
+            return ExecutionResult(data=None, errors=errors)
+
+        operation_ast = get_operation_ast(document, operation_name)
+        if request.method.lower() == "get" and operation_ast is not None and operation_ast.operation != OperationType.QUERY:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseNotAllowed(
+                ["POST"], f"Can only perform a {operation_ast.operation.value} operation from a POST request.",
+            ))
+        if self.persisted_hash and sent_text:
+            # only once the operation may run over this method at all
+            register_query(self.persisted_hash, query)
+
+        max_depth, max_cost = limits_for(self.authenticate(request))
+
+        def on_measured(depth, cost):
+            # the costliest operation in the document
+            if self.query_cost is None or cost > self.query_cost["requested"]:
+                self.query_cost = {"requested": cost, "maximum": max_cost, "depth": depth, "maxDepth": max_depth}
+
+        errors = validate(schema, document, [
+            query_cost_rule(max_depth, max_cost, variables if isinstance(variables, dict) else {}, on_measured),
+        ])
+        if errors:
+            return ExecutionResult(data=None, errors=errors)
+
+        result = self.execute_document(request, document, operation_ast, variables, operation_name)
+        self.cacheable = request.method.lower() == "get" and bool(self.persisted_hash) and not result.errors
+        return result
+
+    def execute_document(self, request, document, operation_ast, variables, operation_name):
+        # as GraphQLView runs a parsed document, atomic mutations included
+        schema = self.schema.graphql_schema
+        execute_options = {
+            "root_value": self.get_root_value(request),
+            "context_value": self.get_context(request),
+            "variable_values": variables,
+            "operation_name": operation_name,
+            "middleware": self.get_middleware(request),
+            "execution_context_class": self.execution_context_class,
+        }
+        try:
+            if operation_ast is not None and operation_ast.operation == OperationType.MUTATION and (
+                graphene_settings.ATOMIC_MUTATIONS is True
+                or connection.settings_dict.get("ATOMIC_MUTATIONS", False) is True
+            ):
+                with transaction.atomic():
+                    result = execute(schema, document, **execute_options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
+            return execute(schema, document, **execute_options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+    def json_encode(self, request, d, pretty=False):
+        if self.query_cost is not None:
+            d = {**d, "extensions": {"cost": self.query_cost}}
+        return super().json_encode(request, d, pretty)
+
 
 # class DjangoContextGraphQLView(GraphQLView):
 #     graphiql = True
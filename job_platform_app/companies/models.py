@@ -21,6 +21,7 @@ class Company(models.Model):
     logo = models.ImageField(upload_to="company_logos/", null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -35,6 +35,26 @@ class CompaniesAPITest(APITestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertEqual(resp.data["name"], "Acme")
 
+    def test_conditional_get(self):
+        company = Company.objects.create(owner=self.admin, name="Acme", description="Test")
+
+        resp = self.client.get(self.list_url)
+        resp = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        detail = reverse("company-detail", kwargs={"pk": str(company.id)})
+        etag = self.client.get(detail)["ETag"]
+        resp = self.client.get(detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # a delete changes the list validator even though max(updated_at) may not
+        list_etag = self.client.get(self.list_url)["ETag"]
+        Company.objects.create(owner=self.admin, name="Other")
+        Company.objects.filter(name="Other").delete()
+        company.delete()
+        resp = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
     def test_only_admin_can_create_company(self):
         payload = {"name": "NewCo", "description": "Desc"}
         
@@ -4,11 +4,14 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from .models import Company
 from .serializers import CompanySerializer
 from common.permissions import IsAdmin
+from common.conditional import ConditionalGetMixin
 
 
-class CompanyListCreateView(generics.ListCreateAPIView):
+class CompanyListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
+    # cached list counts and validators
+    cache_models = (Company,)
 
     def get_permissions(self):
         if self.request.method == "POST":
@@ -19,7 +22,7 @@ class CompanyListCreateView(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class CompanyDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CompanyDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
 
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
      # third-party
     'rest_framework',
@@ -176,10 +177,117 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
 
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'common.pagination.CountingLimitOffsetPagination',
     'PAGE_SIZE': 100
 }
 
+# cache: use a shared backend (e.g. django.core.cache.backends.redis.RedisCache)
+# in production so generation bumps reach every worker
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'job-platform'),
+    }
+}
+
+# anonymous read cache for job and category endpoints (seconds)
+RESPONSE_CACHE = {
+    "TIMEOUT": int(os.getenv("RESPONSE_CACHE_TIMEOUT", 60)),
+    # how long a stale entry may still be served while one request refreshes it
+    "STALE_TIMEOUT": 30,
+    "LOCK_TIMEOUT": 10,
+}
+
+# list counts (common.pagination.CountingLimitOffsetPagination)
+PAGINATION = {
+    # above this many estimated rows, return the planner's estimate instead of COUNT(*)
+    "COUNT_ESTIMATE_THRESHOLD": int(os.getenv("PAGINATION_COUNT_ESTIMATE_THRESHOLD", 10000)),
+    "COUNT_CACHE_TIMEOUT": 300,
+    # GraphQL connections: page size without `first`, and the most one page may hold
+    "GRAPHQL_PAGE_SIZE": int(os.getenv("GRAPHQL_PAGE_SIZE", 20)),
+    "GRAPHQL_MAX_PAGE_SIZE": int(os.getenv("GRAPHQL_MAX_PAGE_SIZE", 100)),
+}
+
+# job posting lifecycle
+JOB_LIFECYCLE = {
+    # new postings expire after this many days unless given expires_at (0 = never)
+    "DEFAULT_TTL_DAYS": int(os.getenv("JOB_DEFAULT_TTL_DAYS", 60)),
+    # rows per UPDATE in the expire_jobs command
+    "EXPIRE_BATCH_SIZE": 1000,
+}
+
+# what to do when a new posting matches an open one: reject (400),
+# merge (renew the existing posting instead) or flag (save with duplicate_of)
+JOB_DUPLICATES = {
+    "POLICY": os.getenv("JOB_DUPLICATE_POLICY", "reject"),
+}
+
+# job view counting: views are buffered per process and added to
+# Job.view_count every FLUSH_INTERVAL seconds (0 = only at exit)
+JOB_VIEWS = {
+    "FLUSH_INTERVAL": float(os.getenv("JOB_VIEWS_FLUSH_INTERVAL", 5)),
+    "MAX_PENDING": 10000,
+}
+
+# ?ordering=trending: applications and views with exponential decay,
+# folded into a rollup by the refresh_trending command (run it every few minutes)
+TRENDING = {
+    # an event counts half as much after this many hours; run
+    # refresh_trending --reset after changing it
+    "HALF_LIFE_HOURS": float(os.getenv("TRENDING_HALF_LIFE_HOURS", 24)),
+    "APPLICATION_WEIGHT": 5.0,
+    "VIEW_WEIGHT": 1.0,
+    # rows whose decayed score falls below this are dropped
+    "MIN_SCORE": 0.05,
+}
+
+# profile-to-job recommendations
+RECOMMENDATIONS = {
+    # hashed vector size; each process holds DIMENSIONS * 4 bytes per job,
+    # run rebuild_job_vectors after changing it
+    "DIMENSIONS": int(os.getenv("RECOMMENDATIONS_DIMENSIONS", 256)),
+    "LIMIT": 20,
+    "MAX_LIMIT": 100,
+    # seconds deleted jobs are remembered for; processes that haven't
+    # synced for longer reload every vector
+    "TOMBSTONE_RETENTION": 24 * 3600,
+}
+
+# similar jobs (MinHash + LSH over title and description); run
+# rebuild_similarity_index after changing the shingle size, bands or rows
+SIMILAR_JOBS = {
+    "SHINGLE_SIZE": 2,
+    # BANDS * ROWS hashes per signature; jobs around (1 / BANDS) ** (1 / ROWS)
+    # Jaccard similarity or more share a bucket
+    "BANDS": 20,
+    "ROWS": 3,
+    # minimum estimated Jaccard similarity to be listed
+    "THRESHOLD": float(os.getenv("SIMILAR_JOBS_THRESHOLD", 0.2)),
+    # most bucket-mates compared per lookup
+    "CANDIDATE_LIMIT": 200,
+    "LIMIT": 5,
+    "MAX_LIMIT": 20,
+}
+
+# job search tuning
+JOB_SEARCH = {
+    # minimum pg_trgm word similarity for fuzzy matches and suggestions
+    "TRIGRAM_THRESHOLD": float(os.getenv("JOB_SEARCH_TRIGRAM_THRESHOLD", 0.3)),
+    "SUGGESTION_LIMIT": 5,
+    # typeahead results per request (default / cap) and how long a prefix is cached
+    "AUTOCOMPLETE_LIMIT": 8,
+    "AUTOCOMPLETE_MAX_LIMIT": 20,
+    "AUTOCOMPLETE_CACHE_TIMEOUT": 60,
+}
+
+# %> (fuzzy search) only uses the trigram indexes with the session's own
+# threshold, so every connection starts with ours instead of setting it per
+# query. Behind a pooler that drops startup options, set it on the role:
+# ALTER ROLE ... SET pg_trgm.word_similarity_threshold = ...
+DATABASES["default"].setdefault("OPTIONS", {})["options"] = (
+    f"-c pg_trgm.word_similarity_threshold={JOB_SEARCH['TRIGRAM_THRESHOLD']}"
+)
+
 
 # JWT Setup
 SIMPLE_JWT = {
@@ -221,6 +329,43 @@ GRAPHENE = {
     ],
 }
 
+# GraphQL queries deeper or costlier than their role's limits are rejected
+# before anything runs, see common.query_cost
+GRAPHQL_COST = {
+    "LIMITS": {
+        "anonymous": {
+            "MAX_DEPTH": int(os.getenv("GRAPHQL_ANONYMOUS_MAX_DEPTH", 6)),
+            "MAX_COST": int(os.getenv("GRAPHQL_ANONYMOUS_MAX_COST", 500)),
+        },
+        "user": {
+            "MAX_DEPTH": int(os.getenv("GRAPHQL_USER_MAX_DEPTH", 8)),
+            "MAX_COST": int(os.getenv("GRAPHQL_USER_MAX_COST", 5000)),
+        },
+        "admin": {
+            "MAX_DEPTH": int(os.getenv("GRAPHQL_ADMIN_MAX_DEPTH", 10)),
+            "MAX_COST": int(os.getenv("GRAPHQL_ADMIN_MAX_COST", 20000)),
+        },
+    },
+    # assumed length of lists without a first/limit argument
+    "DEFAULT_LIST_SIZE": 100,
+    # extra cost of resolving these "Type.field"s, on top of 1 per object returned
+    "FIELD_COSTS": {
+        "Query.recommendedJobs": 10,
+        "Query.jobSuggestions": 5,
+        "JobType.similarJobs": 10,
+    },
+}
+
+# automatic persisted queries, see common.persisted_queries
+PERSISTED_QUERIES = {
+    # parsed and validated documents kept per worker
+    "VALIDATION_CACHE_SIZE": int(os.getenv("PERSISTED_QUERIES_VALIDATION_CACHE_SIZE", 500)),
+    # how long a registered hash -> query text mapping lives in the cache
+    "QUERY_TIMEOUT": int(os.getenv("PERSISTED_QUERIES_TIMEOUT", 7 * 24 * 3600)),
+    # Cache-Control max-age of GET responses to persisted queries
+    "MAX_AGE": int(os.getenv("PERSISTED_QUERIES_MAX_AGE", 60)),
+}
+
 AUTHENTICATION_BACKENDS = [
     "graphql_jwt.backends.JSONWebTokenBackend",
     "django.contrib.auth.backends.ModelBackend",
@@ -0,0 +1,170 @@
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import CharField, Count, F, Func, Min, Value
+from django.db.models.functions import Greatest, Lower, Trim
+
+from common.cache import make_key
+from locations.models import City
+
+from .models import Job, SearchTerm
+
+
+def normalize(label):
+    return " ".join(label.split()).lower()
+
+
+def _normalized(expression):
+    # normalize() in SQL: collapse whitespace, trim, lowercase
+    collapsed = Func(
+        expression, Value(r"\s+"), Value(" "), Value("g"),
+        function="regexp_replace", output_field=CharField(),
+    )
+    return Lower(Trim(collapsed))
+
+
+def city_of(location):
+    # job locations are free text like "Lagos, NG"
+    return location.split(",", 1)[0].strip() if location else ""
+
+
+def job_terms(title, company, location):
+    """
+    The (kind, label) pairs a job contributes to the autocomplete weights.
+    """
+    return [("title", title), ("company", company), ("city", city_of(location))]
+
+
+def adjust_weights(deltas):
+    """
+    Apply weight changes, a Counter of (kind, label) -> delta. Titles and
+    companies are upserted in one statement and dropped once unused;
+    cities are only re-weighted, their rows follow the City table.
+    """
+    grouped = Counter()
+    labels = {}
+    for (kind, label), delta in deltas.items():
+        term = normalize(label or "")
+        if term:
+            grouped[kind, term] += delta
+            labels.setdefault((kind, term), label.strip())
+
+    table = connection.ops.quote_name(SearchTerm._meta.db_table)
+    added = [
+        (kind, term, labels[kind, term], delta)
+        for (kind, term), delta in grouped.items() if kind != "city" and delta > 0
+    ]
+
+    with transaction.atomic():
+        if added:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (kind, term, label, weight) "
+                    f"VALUES {', '.join(['(%s, %s, %s, %s)'] * len(added))} "
+                    f"ON CONFLICT (kind, term) DO UPDATE SET weight = {table}.weight + EXCLUDED.weight",
+                    [value for row in added for value in row],
+                )
+
+        for (kind, term), delta in grouped.items():
+            if delta < 0 or (kind == "city" and delta):
+                SearchTerm.objects.filter(kind=kind, term=term).update(
+                    weight=Greatest(F("weight") + delta, 0)
+                )
+
+        SearchTerm.objects.filter(
+            kind__in=["title", "company"],
+            term__in=[term for (kind, term), delta in grouped.items() if delta < 0],
+            weight=0,
+        ).delete()
+
+
+def _job_city():
+    first_part = Func(F("location"), Value(","), Value(1), function="split_part", output_field=CharField())
+    return _normalized(first_part)
+
+
+def city_weights():
+    """
+    Number of jobs per (normalized) city name, from the first part of each
+    job's location.
+    """
+    rows = Job.objects.annotate(city=_job_city()).values("city").annotate(n=Count("id")).order_by()
+    return {row["city"]: row["n"] for row in rows}
+
+
+def sync_city_terms(names):
+    """
+    Add, re-weight or drop the city rows for these names after a City
+    change (rare, so counting the matching jobs is fine).
+    """
+    for term in {normalize(name) for name in names if name}:
+        labels = [
+            name for name in City.objects.filter(name__iexact=term).values_list("name", flat=True)
+            if normalize(name) == term
+        ]
+        if not labels:
+            SearchTerm.objects.filter(kind="city", term=term).delete()
+            continue
+        weight = Job.objects.annotate(city=_job_city()).filter(city=term).count()
+        SearchTerm.objects.update_or_create(
+            kind="city", term=term,
+            defaults={"weight": weight},
+            create_defaults={"label": labels[0].strip(), "weight": weight},
+        )
+
+
+def rebuild_search_terms(batch_size=1000):
+    """
+    Recompute every autocomplete row from the jobs and cities tables.
+    """
+    def job_rows(kind):
+        rows = (
+            Job.objects.annotate(term=_normalized(F(kind))).exclude(term="").values("term")
+            .annotate(label=Min(kind), weight=Count("id")).order_by()
+        )
+        for row in rows.iterator(chunk_size=batch_size):
+            yield SearchTerm(kind=kind, term=row["term"], label=row["label"].strip(), weight=row["weight"])
+
+    def city_rows():
+        weights = city_weights()
+        seen = set()
+        for name in City.objects.values_list("name", flat=True).iterator(chunk_size=batch_size):
+            term = normalize(name)
+            if term and term not in seen:
+                seen.add(term)
+                yield SearchTerm(kind="city", term=term, label=name, weight=weights.get(term, 0))
+
+    with transaction.atomic():
+        SearchTerm.objects.all().delete()
+        batch = []
+        for rows in (job_rows("title"), job_rows("company"), city_rows()):
+            for term in rows:
+                batch.append(term)
+                if len(batch) >= batch_size:
+                    SearchTerm.objects.bulk_create(batch)
+                    batch.clear()
+        SearchTerm.objects.bulk_create(batch)
+
+
+def autocomplete(prefix, kinds=None, limit=None):
+    """
+    Most popular titles, companies and cities starting with `prefix`,
+    from the SearchTerm prefix index, cached briefly per prefix.
+    """
+    options = settings.JOB_SEARCH
+    limit = min(limit or options["AUTOCOMPLETE_LIMIT"], options["AUTOCOMPLETE_MAX_LIMIT"])
+    term = normalize(prefix)
+    if not term:
+        return []
+    kinds = sorted(kinds or [])
+
+    def lookup():
+        queryset = SearchTerm.objects.filter(term__startswith=term)
+        if kinds:
+            queryset = queryset.filter(kind__in=kinds)
+        return list(queryset.order_by("-weight", "term").values("kind", "label", "weight")[:limit])
+
+    key = make_key("autocomplete", term, kinds, limit)
+    return cache.get_or_set(key, lookup, options["AUTOCOMPLETE_CACHE_TIMEOUT"])
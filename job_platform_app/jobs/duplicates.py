@@ -0,0 +1,88 @@
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+from common.cache import bump_generation
+
+from .models import Job, default_expiry
+from .text import tokens
+
+
+REJECT, MERGE, FLAG = "reject", "merge", "flag"
+DUPLICATE_POLICIES = (REJECT, MERGE, FLAG)
+
+# fields that feed Job.fingerprint
+FINGERPRINT_FIELDS = ("title", "company", "location", "description")
+
+
+class DuplicateJob(Exception):
+    def __init__(self, duplicate):
+        self.duplicate = duplicate
+        super().__init__(f"This job duplicates the open posting {duplicate.pk}.")
+
+
+def fingerprint(title, company, location, description):
+    """
+    Content hash of a posting that ignores case, punctuation, spacing and
+    filler words, so trivially edited re-posts get the same value.
+    """
+    parts = (" ".join(tokens(value)) for value in (title, company, location, description))
+    return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+
+def fingerprint_of(fields):
+    return fingerprint(*(fields.get(name) for name in FINGERPRINT_FIELDS))
+
+
+def duplicate_policy():
+    policy = settings.JOB_DUPLICATES["POLICY"]
+    if policy not in DUPLICATE_POLICIES:
+        raise ImproperlyConfigured(f"JOB_DUPLICATES['POLICY'] must be one of {', '.join(DUPLICATE_POLICIES)}.")
+    return policy
+
+
+def find_duplicate(fields):
+    """
+    The oldest active job with the same fingerprint (one lookup on the
+    open-jobs fingerprint index), or None.
+    """
+    return Job.objects.active().filter(fingerprint=fingerprint_of(fields)).order_by("created_at").first()
+
+
+def renew(pks, expires_at):
+    """
+    Push the expiry of re-posted jobs out to `expires_at` (None = never),
+    never bringing it forward.
+    """
+    jobs = Job.objects.filter(pk__in=pks)
+    if expires_at is None:
+        jobs = jobs.exclude(expires_at=None)
+    else:
+        jobs = jobs.filter(expires_at__lt=expires_at)
+    # update() skips post_save, so invalidate the cached reads here
+    if jobs.update(expires_at=expires_at, updated_at=timezone.now()):
+        bump_generation(Job)
+
+
+def check_duplicate(fields):
+    """
+    Apply the duplicate policy to a job about to be created from `fields`.
+    Raises DuplicateJob (reject), returns the renewed existing job to use
+    instead (merge) or None to go ahead, with `duplicate_of` set in
+    `fields` when flagging.
+    """
+    duplicate = find_duplicate(fields)
+    if duplicate is None:
+        return None
+
+    policy = duplicate_policy()
+    if policy == REJECT:
+        raise DuplicateJob(duplicate)
+    if policy == MERGE:
+        renew([duplicate.pk], fields.get("expires_at", default_expiry()))
+        duplicate.refresh_from_db()
+        return duplicate
+    fields["duplicate_of"] = duplicate
+    return None
@@ -0,0 +1,33 @@
+from .models import Job
+
+
+# output column -> attribute path
+JOB_EXPORT_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "company": "company",
+    "location": "location",
+    "full_location": "full_location",
+    "latitude": "latitude",
+    "longitude": "longitude",
+    "job_type": "job_type",
+    "salary_min": "salary_min",
+    "salary_max": "salary_max",
+    "category": "category.slug",
+    "posted_by": "posted_by.email",
+    "status": "status",
+    "expires_at": "expires_at",
+    "duplicate_of": "duplicate_of_id",
+    "view_count": "view_count",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+
+def job_export_queryset():
+    return (
+        Job.objects.select_related("category", "posted_by")
+        .defer("search_vector")
+        .order_by("created_at", "id")
+    )
@@ -0,0 +1,47 @@
+from collections import defaultdict
+
+from django.db.models import Count
+
+from .filters import SALARY_BANDS, SALARY_UNSPECIFIED, salary_band_expression
+from .models import Job
+
+
+def job_facets(queryset):
+    """
+    Counts per job type, category and salary band for an already filtered
+    queryset, from a single GROUP BY over the three facets.
+    """
+    rows = (
+        queryset.order_by()
+        .annotate(salary_band=salary_band_expression())
+        .values("job_type", "category_id", "category__name", "category__slug", "salary_band")
+        .annotate(count=Count("id"))
+    )
+
+    total = 0
+    job_types = defaultdict(int)
+    bands = defaultdict(int)
+    categories = {}
+    for row in rows:
+        total += row["count"]
+        job_types[row["job_type"]] += row["count"]
+        bands[row["salary_band"]] += row["count"]
+        if row["category_id"] is not None:
+            category = categories.setdefault(row["category_id"], {
+                "id": row["category_id"],
+                "name": row["category__name"],
+                "slug": row["category__slug"],
+                "count": 0,
+            })
+            category["count"] += row["count"]
+
+    band_values = [value for value, _, _ in SALARY_BANDS] + [SALARY_UNSPECIFIED]
+    return {
+        "count": total,
+        "job_type": [
+            {"value": value, "label": label, "count": job_types[value]}
+            for value, label in Job.JOB_TYPE_CHOICES
+        ],
+        "category": sorted(categories.values(), key=lambda c: (-c["count"], c["name"])),
+        "salary_band": [{"value": value, "count": bands[value]} for value in band_values],
+    }
@@ -0,0 +1,121 @@
+from django.db.models import Case, CharField, Q, Value, When
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from .geo import parse_near, within_radius
+from .models import Job
+from .search import full_text_search, fuzzy_search
+from .trending import order_by_trending
+
+
+# (value, lower bound inclusive, upper bound exclusive) on salary_min
+SALARY_BANDS = [
+    ("0-50k", 0, 50000),
+    ("50k-100k", 50000, 100000),
+    ("100k-150k", 100000, 150000),
+    ("150k+", 150000, None),
+]
+SALARY_UNSPECIFIED = "unspecified"
+
+# ?status=all lifts the default active-only filter
+STATUS_ALL = "all"
+
+
+def salary_band_q(band):
+    if band == SALARY_UNSPECIFIED:
+        return Q(salary_min__isnull=True)
+    for value, low, high in SALARY_BANDS:
+        if value == band:
+            q = Q(salary_min__gte=low)
+            if high is not None:
+                q &= Q(salary_min__lt=high)
+            return q
+    return None
+
+
+def salary_band_expression():
+    """
+    The salary band of each row, for grouping.
+    """
+    whens = [When(salary_min__isnull=True, then=Value(SALARY_UNSPECIFIED))]
+    whens += [When(salary_band_q(value), then=Value(value)) for value, _, _ in SALARY_BANDS]
+    return Case(*whens, output_field=CharField())
+
+
+def filter_jobs(queryset, params):
+    """
+    The manual job list filters, shared by the list, facets and GraphQL.
+    Only active (open, unexpired) jobs unless `status` says otherwise.
+    """
+    status = params.get("status") or Job.STATUS_OPEN
+    job_type = params.get("job_type")
+    category = params.get("category")
+    salary_band = params.get("salary_band")
+    near = params.get("near")
+
+    if status == Job.STATUS_OPEN:
+        queryset = queryset.active()
+    elif status in dict(Job.STATUS_CHOICES):
+        queryset = queryset.filter(status=status)
+    elif status != STATUS_ALL:
+        raise ValidationError({"status": f"Expected one of {', '.join([*dict(Job.STATUS_CHOICES), STATUS_ALL])}."})
+
+    if job_type:
+        queryset = queryset.filter(job_type=job_type)
+
+    if category:
+        queryset = queryset.filter(category_id=category)
+
+    if salary_band:
+        q = salary_band_q(salary_band)
+        queryset = queryset.filter(q) if q is not None else queryset.none()
+
+    if near:
+        try:
+            lat, lng, radius_km = parse_near(near, params.get("radius_km"))
+        except ValueError:
+            raise ValidationError({"near": "Expected near=lat,lng and a positive radius_km."})
+        queryset = within_radius(queryset, lat, lng, radius_km)
+
+    return queryset
+
+
+def order_jobs(queryset, ordering):
+    """
+    Explicit orderings on top of the default (newest first / best match).
+    """
+    if ordering == "distance":
+        if "distance_km" not in queryset.query.annotations:
+            raise ValidationError({"ordering": "Ordering by distance needs near=lat,lng."})
+        return queryset.order_by("distance_km", "-created_at", "-id")
+    if ordering == "trending":
+        return order_by_trending(queryset)
+    return queryset
+
+
+class JobSearchFilter(filters.SearchFilter):
+    """
+    Same `?search=` parameter as DRF's SearchFilter, but backed by the
+    Postgres full-text index instead of ILIKE over each field.
+    `?search_mode=fuzzy` switches to trigram matching on title and company.
+    """
+    search_mode_param = "search_mode"
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, "").strip()
+        if not term:
+            return queryset
+        if request.query_params.get(self.search_mode_param) == "fuzzy":
+            return fuzzy_search(queryset, term)
+        return full_text_search(queryset, term)
+
+
+class JobOrderingFilter(filters.BaseFilterBackend):
+    """
+    `?ordering=distance` (with `near=`) or `?ordering=trending`. Runs after
+    the search backend so it overrides relevance ordering.
+    """
+    ordering_param = "ordering"
+
+    def filter_queryset(self, request, queryset, view):
+        return order_jobs(queryset, request.query_params.get(self.ordering_param))
@@ -0,0 +1,71 @@
+import math
+
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_RADIUS_KM = 25
+
+
+def parse_near(near, radius_km=None):
+    """
+    Parse `near=lat,lng` and `radius_km=` query values. Raises ValueError.
+    """
+    lat, lng = (float(part) for part in near.split(","))
+    radius = float(radius_km) if radius_km not in (None, "") else DEFAULT_RADIUS_KM
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180) or radius <= 0:
+        raise ValueError("Coordinates or radius out of range")
+    return lat, lng, radius
+
+
+def bounding_box_q(lat, lng, radius_km):
+    """
+    A lat/lng box around the circle, answerable from the (latitude,
+    longitude) index. Handles boxes crossing a pole or the antimeridian.
+    """
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - delta_lat, lat + delta_lat
+    q = Q(latitude__gte=max(min_lat, -90), latitude__lte=min(max_lat, 90))
+
+    # the box contains a pole: every longitude is in range
+    if min_lat <= -90 or max_lat >= 90:
+        return q
+
+    delta_lng = math.degrees(
+        math.asin(min(1, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat))))
+    )
+    min_lng, max_lng = lng - delta_lng, lng + delta_lng
+    if min_lng < -180:
+        return q & (Q(longitude__gte=min_lng + 360) | Q(longitude__lte=max_lng))
+    if max_lng > 180:
+        return q & (Q(longitude__gte=min_lng) | Q(longitude__lte=max_lng - 360))
+    return q & Q(longitude__gte=min_lng, longitude__lte=max_lng)
+
+
+def great_circle_km(lat, lng):
+    """
+    Haversine distance in km from (lat, lng) to each row.
+    """
+    row_lat = Radians(Cast("latitude", FloatField()))
+    row_lng = Radians(Cast("longitude", FloatField()))
+    lat, lng = math.radians(lat), math.radians(lng)
+
+    a = (
+        Power(Sin((row_lat - lat) / 2), 2)
+        + math.cos(lat) * Cos(row_lat) * Power(Sin((row_lng - lng) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a), output_field=FloatField())
+
+
+def within_radius(queryset, lat, lng, radius_km):
+    """
+    Jobs within `radius_km` of a point, annotated with `distance_km`.
+    The box prefilter does the index work, the exact distance only runs on
+    rows inside it.
+    """
+    return (
+        queryset.filter(bounding_box_q(lat, lng, radius_km))
+        .annotate(distance_km=great_circle_km(lat, lng))
+        .filter(distance_km__lte=radius_km)
+    )
@@ -0,0 +1,178 @@
+import codecs
+import csv
+import json
+from collections import defaultdict
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .duplicates import FLAG, MERGE, REJECT, duplicate_policy, fingerprint, renew
+from .models import Job, JobCategory
+from .signals import jobs_imported
+
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# errors kept for the report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+class JobImportSerializer(serializers.ModelSerializer):
+    """
+    JobSerializer's write fields for feed rows, with the category given by
+    slug and resolved against a map preloaded into the context.
+    """
+    category = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    class Meta:
+        model = Job
+        fields = [
+            "title",
+            "description",
+            "company",
+            "location",
+            "full_location",
+            "latitude",
+            "longitude",
+            "job_type",
+            "salary_min",
+            "salary_max",
+            "category",
+            "expires_at",
+        ]
+
+    def validate_category(self, value):
+        if not value:
+            return None
+        try:
+            return self.context["categories"][value]
+        except KeyError:
+            raise serializers.ValidationError(f"Unknown category slug '{value}'.")
+
+
+def read_csv(stream):
+    """
+    Yield (line number, row) from a CSV stream with a header line. Blank
+    cells are treated as missing.
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {key: value for key, value in row.items() if key and value != ""}
+
+
+def read_jsonl(stream):
+    """
+    Yield (line number, row) from a stream of one JSON object per line.
+    """
+    for line_num, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_num, exc
+            continue
+        yield line_num, row
+
+
+def read_rows(stream, fmt):
+    """
+    Rows from a text or binary (e.g. uploaded) stream, read lazily.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', expected one of {', '.join(IMPORT_FORMATS)}.")
+    if isinstance(stream.read(0), bytes):
+        stream = codecs.getreader("utf-8-sig")(stream)
+    return read_csv(stream) if fmt == "csv" else read_jsonl(stream)
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.merged = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        return {"created": self.created, "merged": self.merged, "failed": self.failed, "errors": self.errors}
+
+
+def import_jobs(rows, posted_by, batch_size=1000, on_error=None):
+    """
+    Validate rows with JobImportSerializer and insert the valid ones with
+    one bulk_create per batch, so only a batch is held in memory at a
+    time. Each batch is its own transaction; invalid rows are reported
+    (and passed to `on_error(line, errors)`) without stopping the import.
+
+    Rows duplicating an open job (or an earlier row) are handled by the
+    duplicate policy, with one fingerprint lookup per batch.
+    """
+    categories = dict(JobCategory.objects.values_list("slug", "pk"))
+    context = {"categories": categories}
+    policy = duplicate_policy()
+    result = ImportResult()
+    batch = []
+
+    def report(line, errors):
+        result.add_error(line, errors)
+        if on_error is not None:
+            on_error(line, errors)
+
+    def flush():
+        # oldest open job per fingerprint; earlier batches are in there too
+        existing = dict(
+            Job.objects.active().filter(fingerprint__in={job.fingerprint for _, job in batch})
+            .order_by("-created_at").values_list("fingerprint", "pk")
+        )
+        new_jobs, renewals = [], defaultdict(list)
+        for line, job in batch:
+            duplicate = existing.get(job.fingerprint)
+            if duplicate is None:
+                existing[job.fingerprint] = job.pk
+                new_jobs.append(job)
+            elif policy == REJECT:
+                report(line, {"non_field_errors": [f"This job duplicates the open posting {duplicate}."]})
+            elif policy == MERGE:
+                renewals[job.expires_at].append(duplicate)
+                result.merged += 1
+            elif policy == FLAG:
+                job.duplicate_of_id = duplicate
+                new_jobs.append(job)
+
+        with transaction.atomic():
+            created = Job.objects.bulk_create(new_jobs)
+            for expires_at, pks in renewals.items():
+                renew(pks, expires_at)
+            # bulk_create skips post_save, see jobs.signals
+            jobs_imported.send(sender=Job, pks=[job.pk for job in created])
+        result.created += len(created)
+        batch.clear()
+
+    for line, row in rows:
+        if not isinstance(row, dict):
+            errors = {"non_field_errors": [str(row) if isinstance(row, Exception) else "Expected an object."]}
+        else:
+            serializer = JobImportSerializer(data=row, context=context)
+            if serializer.is_valid():
+                data = serializer.validated_data
+                category_id = data.pop("category", None)
+                job = Job(**data, category_id=category_id, posted_by=posted_by)
+                # bulk_create skips pre_save, which sets this for single saves
+                job.fingerprint = fingerprint(job.title, job.company, job.location, job.description)
+                batch.append((line, job))
+                if len(batch) >= batch_size:
+                    flush()
+                continue
+            errors = serializer.errors
+
+        report(line, errors)
+
+    if batch:
+        flush()
+    return result
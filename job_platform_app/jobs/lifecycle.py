@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Now
+
+from common.cache import bump_generation
+
+from .models import Job
+
+
+def overdue_jobs():
+    return Job.objects.filter(status=Job.STATUS_OPEN, expires_at__lte=Now())
+
+
+def expire_jobs(batch_size=None, on_batch=None):
+    """
+    Flip open jobs past their expires_at to expired, `batch_size` rows per
+    UPDATE so the archiver never holds long locks. Returns how many jobs
+    were expired; `on_batch(total)` is called after each batch.
+    """
+    batch_size = batch_size or settings.JOB_LIFECYCLE["EXPIRE_BATCH_SIZE"]
+    total = 0
+    while True:
+        with transaction.atomic():
+            pks = list(overdue_jobs().order_by("expires_at").values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            # re-check the status so a job reopened meanwhile stays open
+            # bump updated_at too, or detail ETags would keep matching
+            total += overdue_jobs().filter(pk__in=pks).update(status=Job.STATUS_EXPIRED, updated_at=Now())
+        if on_batch is not None:
+            on_batch(total)
+
+    if total:
+        # update() skips post_save, so invalidate the cached reads here
+        bump_generation(Job)
+    return total
@@ -0,0 +1,87 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from common.fastpath import compile_read_plan
+from common.serializers import load_only_serialized
+from jobs.models import Job, JobCategory
+from jobs.serializers import JobSerializer, JobSummarySerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the job list serializer against the compiled read path on "
+        "seeded rows. Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        request = Request(APIRequestFactory().get("/api/v1/jobs/"))
+        renderer = JSONRenderer()
+
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(
+                email="benchmark@example.com", password="benchmark", role="admin"
+            )
+            category = JobCategory.objects.create(name="Benchmark", slug="benchmark")
+
+            seeded = 0
+            for size in sorted(options["sizes"]):
+                Job.objects.bulk_create(
+                    [
+                        Job(
+                            title=f"Job {i}", description="Benchmark job " * 20,
+                            company=f"Company {i % 50}", location="Remote",
+                            job_type="full-time", category=category,
+                            salary_min="50000.00", salary_max="90000.00", posted_by=user,
+                        )
+                        for i in range(seeded, size)
+                    ],
+                    batch_size=1000,
+                )
+                seeded = size
+                jobs = Job.objects.filter(posted_by=user).order_by("-created_at", "-id")
+
+                for serializer_class in (JobSerializer, JobSummarySerializer):
+                    serializer = serializer_class(context={"request": request})
+                    plan = compile_read_plan(serializer)
+
+                    def serialized():
+                        queryset = load_only_serialized(jobs, serializer)
+                        data = serializer_class(queryset, many=True, context={"request": request}).data
+                        return renderer.render(data)
+
+                    def fast():
+                        rows = jobs.values(*plan.columns)
+                        return renderer.render(plan.represent(rows, request))
+
+                    if serialized() != fast():
+                        self.stderr.write(f"{serializer_class.__name__}: outputs differ at {size} rows")
+
+                    slow_time = self.median_time(serialized, options["repeat"])
+                    fast_time = self.median_time(fast, options["repeat"])
+                    self.stdout.write(
+                        f"{serializer_class.__name__:<22} {size:>6} rows  "
+                        f"serializer {slow_time * 1000:8.1f} ms  "
+                        f"fast path {fast_time * 1000:8.1f} ms  "
+                        f"x{slow_time / fast_time:.1f}"
+                    )
+
+            transaction.set_rollback(True)
+
+    def median_time(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from jobs.lifecycle import expire_jobs
+
+
+class Command(BaseCommand):
+    help = "Mark open jobs past their expires_at as expired. Meant to run from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        total = expire_jobs(
+            batch_size=options["batch_size"],
+            on_batch=lambda total: self.stdout.write(f"{total} jobs expired"),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Expired {total} jobs."))
@@ -0,0 +1,39 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.importers import IMPORT_FORMATS, import_jobs, read_rows
+
+
+class Command(BaseCommand):
+    help = "Stream jobs from a CSV or JSONL file into the database in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="defaults to the file extension")
+        parser.add_argument("--posted-by", required=True, help="email of the user the jobs are posted by")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or os.path.splitext(options["path"])[1].lstrip(".").lower()
+        if fmt not in IMPORT_FORMATS:
+            raise CommandError("Can't tell the file format, pass --format csv or --format jsonl.")
+
+        try:
+            posted_by = get_user_model().objects.get(email=options["posted_by"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user with email {options['posted_by']}.")
+
+        def report(line, errors):
+            self.stderr.write(f"line {line}: {errors}")
+
+        with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+            result = import_jobs(
+                read_rows(stream, fmt), posted_by,
+                batch_size=options["batch_size"], on_error=report,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} jobs, merged {result.merged} duplicates, {result.failed} rows rejected."
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from jobs.autocomplete import rebuild_search_terms
+from jobs.models import SearchTerm
+
+
+class Command(BaseCommand):
+    help = "Recompute the autocomplete terms (titles, companies, cities) and their weights."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rebuild_search_terms(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {SearchTerm.objects.count()} autocomplete terms."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from common.pagination import pk_batches
+from jobs.models import Job
+from jobs.search import refresh_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search vectors of all jobs in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = 0
+        for batch in pk_batches(Job.objects.all(), options["batch_size"]):
+            with transaction.atomic():
+                refresh_search_vectors(Job.objects.filter(pk__in=batch))
+
+            total += len(batch)
+            self.stdout.write(f"{total} jobs indexed")
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search vectors for {total} jobs."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import JobTrendingScore
+from jobs.trending import refresh_trending_scores
+
+
+class Command(BaseCommand):
+    help = "Fold recent applications and views into the trending scores. Meant to run from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true",
+            help="start over from the recent applications (e.g. after changing the half-life)",
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            JobTrendingScore.objects.all().delete()
+        updated, pruned = refresh_trending_scores()
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} trending scores, pruned {pruned}."))
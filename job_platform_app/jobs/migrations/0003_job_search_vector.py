@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_search_vectors(apps, schema_editor):
+    # same document as jobs.search.job_search_vector, frozen for this migration
+    Job = apps.get_model("jobs", "Job")
+    JobCategory = apps.get_model("jobs", "JobCategory")
+    SearchVector = django.contrib.postgres.search.SearchVector
+
+    category_name = Subquery(
+        JobCategory.objects.filter(pk=OuterRef("category_id")).values("name")[:1]
+    )
+    Job.objects.update(search_vector=(
+        SearchVector("title", weight="A", config="english")
+        + SearchVector("company", weight="A", config="english")
+        + SearchVector(Coalesce(category_name, Value("")), weight="B", config="english")
+        + SearchVector("description", weight="C", config="english")
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='jobs_job_search__684d46_gin'),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:43
+
+from django.db import migrations, models
+from django.db.models import CharField, Count, F, Func, Min, Value
+from django.db.models.functions import Lower, Trim
+
+
+def populate_search_terms(apps, schema_editor):
+    # same rollup as jobs.autocomplete.rebuild_search_terms, frozen for this migration
+    Job = apps.get_model("jobs", "Job")
+    City = apps.get_model("locations", "City")
+    SearchTerm = apps.get_model("jobs", "SearchTerm")
+
+    def normalized(expression):
+        collapsed = Func(
+            expression, Value(r"\s+"), Value(" "), Value("g"),
+            function="regexp_replace", output_field=CharField(),
+        )
+        return Lower(Trim(collapsed))
+
+    terms = []
+    for kind in ("title", "company"):
+        rows = (
+            Job.objects.annotate(term=normalized(F(kind))).exclude(term="").values("term")
+            .annotate(label=Min(kind), weight=Count("id")).order_by()
+        )
+        terms.extend(
+            SearchTerm(kind=kind, term=row["term"], label=row["label"].strip(), weight=row["weight"])
+            for row in rows
+        )
+
+    city = normalized(Func(F("location"), Value(","), Value(1), function="split_part", output_field=CharField()))
+    weights = {
+        row["city"]: row["n"]
+        for row in Job.objects.annotate(city=city).values("city").annotate(n=Count("id")).order_by()
+    }
+    seen = set()
+    for name in City.objects.values_list("name", flat=True):
+        term = " ".join(name.split()).lower()
+        if term and term not in seen:
+            seen.add(term)
+            terms.append(SearchTerm(kind="city", term=term, label=name.strip(), weight=weights.get(term, 0)))
+
+    SearchTerm.objects.bulk_create(terms, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_location_index'),
+        ('locations', '0002_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('title', 'Job title'), ('company', 'Company'), ('city', 'City')], max_length=10)),
+                ('term', models.CharField(max_length=255)),
+                ('label', models.CharField(max_length=255)),
+                ('weight', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term'], name='jobs_searchterm_prefix', opclasses=['varchar_pattern_ops'])],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'term'), name='jobs_searchterm_kind_term_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_search_terms, migrations.RunPython.noop),
+    ]
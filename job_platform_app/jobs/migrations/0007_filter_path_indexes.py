@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_search_term'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_job_typ_f6c220_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_categor_24d294_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_latitud_d115f8_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['job_type', 'created_at', 'id'], name='jobs_job_type_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='jobs_job_category_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('salary_min__isnull', True)), fields=['created_at', 'id'], name='jobs_job_no_salary_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('latitude__isnull', False)), fields=['latitude', 'longitude'], name='jobs_job_geocoded'),
+        ),
+    ]
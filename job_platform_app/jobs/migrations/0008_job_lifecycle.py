@@ -0,0 +1,91 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:57
+
+import django.contrib.postgres.indexes
+import jobs.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_filter_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_search__684d46_gin',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_title_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_company_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_type_recent',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_category_recent',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_no_salary_recent',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_geocoded',
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, default=jobs.models.default_expiry, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='status',
+            field=models.CharField(choices=[('open', 'Open'), ('closed', 'Closed'), ('expired', 'Expired')], default='open', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['created_at', 'id'], name='jobs_job_open_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['job_type', 'created_at', 'id'], name='jobs_job_type_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['category', 'created_at', 'id'], name='jobs_job_category_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('salary_min__isnull', True), ('status', 'open')), fields=['created_at', 'id'], name='jobs_job_no_salary_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('status', 'open')), fields=['search_vector'], name='jobs_job_open_search'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('status', 'open')), fields=['title'], name='jobs_job_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('status', 'open')), fields=['company'], name='jobs_job_company_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('latitude__isnull', False), ('status', 'open')), fields=['latitude', 'longitude'], name='jobs_job_geocoded'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('expires_at__isnull', False), ('status', 'open')), fields=['expires_at'], name='jobs_job_open_expiry'),
+        ),
+    ]
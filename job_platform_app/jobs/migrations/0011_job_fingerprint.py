@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:09
+
+import hashlib
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset("""
+    a about an and are as at be by for from has have in is it its of on or our
+    that the their this to we will with you your
+""".split())
+
+
+def populate_fingerprints(apps, schema_editor):
+    # same hash as jobs.duplicates.fingerprint, frozen for this migration
+    Job = apps.get_model("jobs", "Job")
+
+    def normalize(text):
+        return " ".join(token for token in TOKEN_RE.findall((text or "").lower()) if token not in STOP_WORDS)
+
+    batch = []
+    for job in Job.objects.only("pk", "title", "company", "location", "description").iterator(chunk_size=2000):
+        parts = (normalize(value) for value in (job.title, job.company, job.location, job.description))
+        job.fingerprint = hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+        batch.append(job)
+        if len(batch) >= 2000:
+            Job.objects.bulk_update(batch, ["fingerprint"])
+            batch.clear()
+    Job.objects.bulk_update(batch, ["fingerprint"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_similarity_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='jobs.job'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+        migrations.RunPython(populate_fingerprints, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['fingerprint'], name='jobs_job_open_fingerprint'),
+        ),
+    ]
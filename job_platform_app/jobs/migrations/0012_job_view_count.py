@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='view_count',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
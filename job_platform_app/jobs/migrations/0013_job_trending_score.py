@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_job_view_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobTrendingScore',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='jobs.job')),
+                ('log_score', models.FloatField(default=float("-inf"))),
+                ('pending_views', models.BigIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(db_index=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-log_score'], name='jobs_trending_score')],
+            },
+        ),
+    ]
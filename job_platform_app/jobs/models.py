@@ -1,5 +1,10 @@
 import uuid
+from datetime import timedelta
 from django.db import models
+from django.db.models.functions import Now
+from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 # from django.contrib.auth import get_user_model
 from location_field.models.plain import PlainLocationField
 from django.conf import settings
@@ -11,12 +16,38 @@ class JobCategory(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(unique=True)
+    # keyset position for GraphQL category pages
+    created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.name
 
 
+def default_expiry():
+    days = settings.JOB_LIFECYCLE["DEFAULT_TTL_DAYS"]
+    return timezone.now() + timedelta(days=days) if days else None
+
+
+class JobQuerySet(models.QuerySet):
+    def active(self):
+        """
+        Open postings that haven't passed their expiry yet (the archiver
+        flips those to expired periodically, this covers the gap).
+        """
+        return self.filter(
+            models.Q(expires_at__isnull=True) | models.Q(expires_at__gt=Now()),
+            status=Job.STATUS_OPEN,
+        )
+
+
 class Job(models.Model):
+    STATUS_OPEN = "open"
+    STATUS_EXPIRED = "expired"
+    STATUS_CHOICES = [
+        ("open", "Open"),
+        ("closed", "Closed"),
+        ("expired", "Expired"),
+    ]
     JOB_TYPE_CHOICES = [
         ("full-time", "Full Time"),
         ("part-time", "Part Time"),
@@ -58,17 +89,168 @@ class Job(models.Model):
         on_delete=models.CASCADE
     )
 
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_OPEN)
+    expires_at = models.DateTimeField(null=True, blank=True, default=default_expiry)
+
+    # normalized content hash for duplicate detection, see jobs.duplicates
+    fingerprint = models.CharField(max_length=40, blank=True, editable=False)
+    # set when a duplicate was let through under the "flag" policy
+    duplicate_of = models.ForeignKey(
+        "self", null=True, blank=True, on_delete=models.SET_NULL, related_name="duplicates"
+    )
+
+    # detail views, written in batches by jobs.popularity.job_views
+    view_count = models.PositiveBigIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = JobQuerySet.as_manager()
+
+    # weighted title/company/category/description document, kept in sync by jobs.signals
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         indexes = [
             models.Index(fields=["title"]),
-            models.Index(fields=["job_type"]),
-            models.Index(fields=["category"]),
-            models.Index(fields=["created_at"]),
+            # keyset pagination walks (created_at, id); this one also serves
+            # ?status=all, closed/expired listings and exports
+            models.Index(fields=["created_at", "id"]),
+            # the rest only cover open postings, which is what list, search
+            # and GraphQL read by default (see JobQuerySet.active), so closed
+            # and expired rows don't bloat the hot indexes
+            models.Index(
+                fields=["created_at", "id"], name="jobs_job_open_recent",
+                condition=models.Q(status="open"),
+            ),
+            # newest first within the list filters (these also serve plain
+            # job_type / category lookups, so no single-column indexes)
+            models.Index(
+                fields=["job_type", "created_at", "id"], name="jobs_job_type_recent",
+                condition=models.Q(status="open"),
+            ),
+            models.Index(
+                fields=["category", "created_at", "id"], name="jobs_job_category_recent",
+                condition=models.Q(status="open"),
+            ),
+            models.Index(
+                fields=["created_at", "id"], name="jobs_job_no_salary_recent",
+                condition=models.Q(status="open", salary_min__isnull=True),
+            ),
+            GinIndex(fields=["search_vector"], name="jobs_job_open_search", condition=models.Q(status="open")),
+            # trigram indexes for fuzzy search
+            GinIndex(
+                fields=["title"], name="jobs_job_title_trgm", opclasses=["gin_trgm_ops"],
+                condition=models.Q(status="open"),
+            ),
+            GinIndex(
+                fields=["company"], name="jobs_job_company_trgm", opclasses=["gin_trgm_ops"],
+                condition=models.Q(status="open"),
+            ),
+            # bounding-box prefilter for radius search, geocoded jobs only
+            models.Index(
+                fields=["latitude", "longitude"], name="jobs_job_geocoded",
+                condition=models.Q(status="open", latitude__isnull=False),
+            ),
+            # duplicate checks only compare against open postings
+            models.Index(
+                fields=["fingerprint"], name="jobs_job_open_fingerprint",
+                condition=models.Q(status="open"),
+            ),
+            # the archiver's scan for overdue postings
+            models.Index(
+                fields=["expires_at"], name="jobs_job_open_expiry",
+                condition=models.Q(status="open", expires_at__isnull=False),
+            ),
         ]
         ordering = ["-created_at"]
 
     def __str__(self):
         return self.title
+
+
+class SearchTerm(models.Model):
+    """
+    Autocomplete rollup: one row per distinct job title, company and city,
+    weighted by how many jobs use it. Kept up to date by jobs.signals and
+    rebuilt with `manage.py rebuild_autocomplete`.
+    """
+    KIND_CHOICES = [
+        ("title", "Job title"),
+        ("company", "Company"),
+        ("city", "City"),
+    ]
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # lowercased label, what prefixes are matched against
+    term = models.CharField(max_length=255)
+    label = models.CharField(max_length=255)
+    weight = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "term"], name="jobs_searchterm_kind_term_uniq"),
+        ]
+        indexes = [
+            # LIKE 'prefix%' lookups regardless of the database collation
+            models.Index(fields=["term"], name="jobs_searchterm_prefix", opclasses=["varchar_pattern_ops"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.label}"
+
+
+class JobVector(models.Model):
+    """
+    A job's hashed term vector (float32, unit length) for recommendations,
+    kept in sync by jobs.signals. See jobs.recommendations.
+    """
+    job = models.OneToOneField(Job, primary_key=True, on_delete=models.CASCADE, related_name="vector")
+    vector = models.BinaryField()
+    # lets each process load only the vectors changed since its last sync
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+
+class JobVectorTombstone(models.Model):
+    """
+    Key of a deleted job's vector, so processes holding the vectors in
+    memory can drop just that row. Pruned after
+    RECOMMENDATIONS["TOMBSTONE_RETENTION"] seconds.
+    """
+    job_id = models.UUIDField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+
+class JobSignature(models.Model):
+    """
+    MinHash signature of a job's title and description (uint32 values),
+    kept in sync by jobs.signals. See jobs.similarity.
+    """
+    job = models.OneToOneField(Job, primary_key=True, on_delete=models.CASCADE, related_name="signature")
+    signature = models.BinaryField()
+
+
+class JobLSHBucket(models.Model):
+    """
+    One row per (job, LSH band): jobs sharing a key are similar-job candidates.
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="lsh_buckets")
+    key = models.BigIntegerField(db_index=True)
+
+
+class JobTrendingScore(models.Model):
+    """
+    Rollup behind ?ordering=trending, for jobs with recent applications or
+    views only. Refreshed by the refresh_trending command, see jobs.trending.
+    """
+    job = models.OneToOneField(Job, primary_key=True, on_delete=models.CASCADE, related_name="trending")
+    # log of the decayed activity, scaled to a fixed epoch so rows only
+    # change when they get new activity; comparable across rows as is
+    log_score = models.FloatField(default=float("-inf"))
+    # views flushed since the last refresh
+    pending_views = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-log_score"], name="jobs_trending_score"),
+        ]
@@ -0,0 +1,9 @@
+from common.counters import BufferedCounter
+
+from .models import Job
+from .trending import record_views
+
+
+# detail page views, buffered in memory and flushed in batches (which
+# also feed the trending rollup)
+job_views = BufferedCounter(Job, "view_count", "JOB_VIEWS", on_flush=record_views)
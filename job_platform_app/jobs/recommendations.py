@@ -0,0 +1,187 @@
+import math
+import threading
+import zlib
+from collections import Counter
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from common.cache import bump_generation, get_generations
+
+from .models import Job, JobVector, JobVectorTombstone
+from .text import tokens
+
+
+# seconds each tombstone check reaches back before the previous one
+TOMBSTONE_OVERLAP = 60
+
+# field weights of a job's document; titles say the most about a posting
+JOB_FIELD_WEIGHTS = {"title": 3.0, "company": 1.0, "category__name": 1.5, "description": 1.0}
+
+# fields that feed the job vectors
+VECTOR_FIELDS = {"title", "company", "description", "category", "category_id"}
+
+
+def embed(parts):
+    """
+    Hash weighted (text, weight) parts into one unit-length float32 vector
+    of RECOMMENDATIONS["DIMENSIONS"] buckets (signed feature hashing with
+    sublinear term frequencies), so no vocabulary has to be stored.
+    """
+    vector = np.zeros(settings.RECOMMENDATIONS["DIMENSIONS"], dtype=np.float32)
+    for text, weight in parts:
+        for token, count in Counter(tokens(text)).items():
+            digest = zlib.crc32(token.encode())
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % vector.size] += sign * weight * (1.0 + math.log(count))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def refresh_job_vectors(pks):
+    """
+    Recompute and store the vectors of these jobs.
+    """
+    rows = Job.objects.filter(pk__in=pks).values_list("pk", *JOB_FIELD_WEIGHTS)
+    vectors = [
+        JobVector(job_id=pk, vector=embed(zip(texts, JOB_FIELD_WEIGHTS.values())).tobytes())
+        for pk, *texts in rows
+    ]
+    JobVector.objects.bulk_create(
+        vectors, update_conflicts=True, unique_fields=["job"], update_fields=["vector", "updated_at"]
+    )
+    bump_generation(JobVector)
+    return len(vectors)
+
+
+def forget_job_vectors(pks):
+    """
+    Tombstone the vectors of these deleted jobs for the in-memory indexes,
+    pruning tombstones past their retention.
+    """
+    JobVectorTombstone.objects.bulk_create([JobVectorTombstone(job_id=pk) for pk in pks])
+    retention = timedelta(seconds=settings.RECOMMENDATIONS["TOMBSTONE_RETENTION"])
+    JobVectorTombstone.objects.filter(deleted_at__lt=timezone.now() - retention).delete()
+    bump_generation(JobVector)
+
+
+def profile_vector(profile):
+    return embed([(profile.headline, 3.0), (profile.bio, 1.0), (profile.resume_text, 1.0)])
+
+
+class JobVectorIndex:
+    """
+    Every stored job vector as one in-memory float32 matrix, so ranking is
+    a single matrix-vector product. Loaded once per process, then topped up
+    with just the vectors changed since (by JobVector.updated_at) whenever
+    the JobVector generation moves, after dropping the rows of jobs
+    tombstoned since.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.ids = []
+        self.rows = {}
+        self.matrix = np.zeros((0, settings.RECOMMENDATIONS["DIMENSIONS"]), dtype=np.float32)
+        self.synced_at = None
+        self.generation = None
+        self.checked_at = None
+
+    def sync(self):
+        [generation] = get_generations(JobVector)
+        with self.lock:
+            if generation == self.generation:
+                return
+            self.generation = generation
+            now = timezone.now()
+            retention = timedelta(seconds=settings.RECOMMENDATIONS["TOMBSTONE_RETENTION"])
+            if self.checked_at is not None and now - self.checked_at > retention:
+                # the tombstones since may be pruned already
+                self.clear()
+            elif self.checked_at is not None:
+                self._drop_deleted()
+            self.checked_at = now
+            self._load()
+
+    def _drop_deleted(self):
+        # the updated_at top-up can't see deletes. Overlap the last check so
+        # deletes committed late aren't missed; dropping twice is harmless
+        since = self.checked_at - timedelta(seconds=TOMBSTONE_OVERLAP)
+        deleted = set(JobVectorTombstone.objects.filter(deleted_at__gte=since).values_list("job_id", flat=True))
+        keep = [row for row, pk in enumerate(self.ids) if pk not in deleted]
+        if len(keep) == len(self.ids):
+            return
+        self.ids = [self.ids[row] for row in keep]
+        self.matrix = self.matrix[keep]
+        self.rows = {pk: row for row, pk in enumerate(self.ids)}
+
+    def _load(self):
+        queryset = JobVector.objects.order_by()
+        if self.synced_at is not None:
+            # >= so rows sharing the last timestamp aren't missed; reapplying is harmless
+            queryset = queryset.filter(updated_at__gte=self.synced_at)
+
+        dimensions = self.matrix.shape[1]
+        added_ids, added = [], []
+        rows = queryset.values_list("job_id", "vector", "updated_at")
+        for pk, data, updated_at in rows.iterator(chunk_size=5000):
+            vector = np.frombuffer(data, dtype=np.float32)
+            if vector.size != dimensions:
+                # stored before DIMENSIONS changed, see rebuild_job_vectors
+                continue
+            if pk in self.rows:
+                self.matrix[self.rows[pk]] = vector
+            else:
+                self.rows[pk] = len(self.ids) + len(added_ids)
+                added_ids.append(pk)
+                added.append(vector)
+            if self.synced_at is None or updated_at > self.synced_at:
+                self.synced_at = updated_at
+
+        if added:
+            self.ids.extend(added_ids)
+            self.matrix = np.vstack([self.matrix, np.array(added)])
+
+    def top(self, query, count):
+        """
+        The `count` best (job pk, score) pairs by cosine similarity.
+        """
+        with self.lock:
+            count = min(count, len(self.ids))
+            if not count:
+                return []
+            scores = self.matrix @ query
+            best = np.argpartition(-scores, count - 1)[:count]
+            best = best[np.argsort(-scores[best])]
+            return [(self.ids[row], float(scores[row])) for row in best]
+
+
+job_vector_index = JobVectorIndex()
+
+
+def recommend_jobs(profile, limit=None):
+    """
+    Active jobs closest to the profile's headline, bio and resume text,
+    as (job, score) pairs, best first.
+    """
+    options = settings.RECOMMENDATIONS
+    limit = min(limit or options["LIMIT"], options["MAX_LIMIT"])
+    query = profile_vector(profile)
+    if not query.any():
+        return []
+
+    job_vector_index.sync()
+    # over-fetch, since some candidates may have closed or expired since
+    count = limit * 4
+    while True:
+        candidates = [(pk, score) for pk, score in job_vector_index.top(query, count) if score > 0]
+        jobs = Job.objects.active().select_related("category").in_bulk([pk for pk, _ in candidates])
+        results = [(jobs[pk], score) for pk, score in candidates if pk in jobs]
+        if len(results) >= limit or len(candidates) < count:
+            return results[:limit]
+        count *= 4
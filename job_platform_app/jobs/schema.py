@@ -1,20 +1,29 @@
 import graphene
-from graphene_django import DjangoObjectType
+from graphene_django import bypass_get_queryset
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
+from common.connections import keyset_connection
+from common.loaders import load_related
+from common.optimizer import OptimizedDjangoObjectType
 
 from .models import Job, JobCategory
+from .filters import filter_jobs, order_jobs
+from .search import full_text_search, fuzzy_search, suggest
+from .recommendations import recommend_jobs
+from .similarity import similar_jobs
+from .duplicates import check_duplicate
+from .popularity import job_views
 
 
 User = get_user_model()
 
 
-class CategoryType(DjangoObjectType):
+class CategoryType(OptimizedDjangoObjectType):
     class Meta:
         model = JobCategory
         fields = ("id", "name", "slug")
 
-class JobType(DjangoObjectType):
+class JobType(OptimizedDjangoObjectType):
     class Meta:
         model = Job
         fields = (
@@ -30,40 +39,124 @@ class JobType(DjangoObjectType):
             "salary_max",
             "category",
             "posted_by",
+            "status",
+            "expires_at",
+            "view_count",
             "created_at",
         )
 
+    similar_jobs = graphene.List(lambda: JobType, limit=graphene.Int())
+
+    @bypass_get_queryset
+    def resolve_category(self, info):
+        return load_related(info, self, "category")
+
+    @bypass_get_queryset
+    def resolve_posted_by(self, info):
+        return load_related(info, self, "posted_by")
+
+    def resolve_similar_jobs(self, info, limit=None):
+        return [job for job, _ in similar_jobs(self, limit)]
+
+
+class CategoryConnection(graphene.relay.Connection):
+    class Meta:
+        node = CategoryType
+
+
+class JobConnection(graphene.relay.Connection):
+    class Meta:
+        node = JobType
+
 
 class JobQuery(graphene.ObjectType):
-    jobs = graphene.List(JobType)
+    jobs = graphene.List(
+        JobType,
+        search=graphene.String(),
+        fuzzy=graphene.Boolean(),
+        near=graphene.String(description="lat,lng"),
+        radius_km=graphene.Float(),
+        ordering=graphene.String(),
+        status=graphene.String(description="open (default), closed, expired or all"),
+        deprecation_reason="Unbounded, use jobsConnection.",
+    )
+    # newest first, with the REST list filters
+    jobs_connection = graphene.Field(
+        JobConnection,
+        first=graphene.Int(),
+        after=graphene.String(),
+        search=graphene.String(),
+        fuzzy=graphene.Boolean(),
+        job_type=graphene.String(),
+        category=graphene.UUID(),
+        salary_band=graphene.String(),
+        near=graphene.String(description="lat,lng"),
+        radius_km=graphene.Float(),
+        status=graphene.String(description="open (default), closed, expired or all"),
+    )
     job = graphene.Field(JobType, id=graphene.UUID(required=True))
+    job_suggestions = graphene.List(graphene.String, term=graphene.String(required=True))
+    recommended_jobs = graphene.List(JobType, limit=graphene.Int())
 
-    categories = graphene.List(CategoryType)
+    categories = graphene.List(CategoryType, deprecation_reason="Unbounded, use categoriesConnection.")
+    categories_connection = graphene.Field(CategoryConnection, first=graphene.Int(), after=graphene.String())
     category = graphene.Field(CategoryType, id=graphene.UUID(required=True))
 
-    def resolve_jobs(root, info):
+    def resolve_jobs(root, info, search=None, fuzzy=False, near=None, radius_km=None, ordering=None, status=None):
+        user = info.context.user
+        if user.is_anonymous:
+            raise Exception("User not logged in!")
+        queryset = filter_jobs(Job.objects.all(), {"near": near, "radius_km": radius_km, "status": status})
+        if search:
+            queryset = fuzzy_search(queryset, search) if fuzzy else full_text_search(queryset, search)
+        return JobType.get_queryset(order_jobs(queryset, ordering), info)
+
+    def resolve_jobs_connection(root, info, first=None, after=None, search=None, fuzzy=False, **filters):
         user = info.context.user
         if user.is_anonymous:
             raise Exception("User not logged in!")
-        return Job.objects.all()
+        queryset = filter_jobs(Job.objects.all(), filters)
+        if search:
+            queryset = fuzzy_search(queryset, search) if fuzzy else full_text_search(queryset, search)
+        return keyset_connection(JobConnection, queryset, info, first, after)
 
     def resolve_job(root, info, id):
         user = info.context.user
         if user.is_anonymous:
             raise Exception("User not logged in!")
-        return Job.objects.get(pk=id)
+        job = JobType.get_queryset(Job.objects.all(), info).get(pk=id)
+        job_views.incr(job.pk)
+        return job
+
+    def resolve_job_suggestions(root, info, term):
+        user = info.context.user
+        if user.is_anonymous:
+            raise Exception("User not logged in!")
+        return suggest(term)
+
+    def resolve_recommended_jobs(root, info, limit=None):
+        user = info.context.user
+        if user.is_anonymous:
+            raise Exception("User not logged in!")
+        return [job for job, _ in recommend_jobs(user.profile, limit)]
 
     def resolve_categories(root, info):
         user = info.context.user
         if user.is_anonymous:
             raise Exception("User not logged in!")
-        return JobCategory.objects.all()
+        return CategoryType.get_queryset(JobCategory.objects.all(), info)
+
+    def resolve_categories_connection(root, info, first=None, after=None):
+        user = info.context.user
+        if user.is_anonymous:
+            raise Exception("User not logged in!")
+        return keyset_connection(CategoryConnection, JobCategory.objects.all(), info, first, after)
 
     def resolve_category(root, info, id):
         user = info.context.user
         if user.is_anonymous:
             raise Exception("User not logged in!")
-        return JobCategory.objects.get(pk=id)
+        return CategoryType.get_queryset(JobCategory.objects.all(), info).get(pk=id)
     
 
 # -------------------------------
@@ -120,7 +213,7 @@ class CreateJob(graphene.Mutation):
         category = get_object_or_404(JobCategory, pk=input.category_id)
         posted_by = get_object_or_404(User, pk=user.id)
 
-        job = Job.objects.create(
+        fields = dict(
             title=input.title,
             description=input.description,
             company=input.company,
@@ -133,6 +226,8 @@ class CreateJob(graphene.Mutation):
             category=category,
             posted_by=posted_by
         )
+        # raises for the "reject" policy, DuplicateJob's message says which job
+        job = check_duplicate(fields) or Job.objects.create(**fields)
 
         return CreateJob(job=job, success=True)
 
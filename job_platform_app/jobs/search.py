@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+)
+from django.db.models import F, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Job, JobCategory
+
+
+SEARCH_CONFIG = "english"
+
+# fields that feed Job.search_vector
+SEARCH_FIELDS = {"title", "company", "description", "category", "category_id"}
+
+
+def job_search_vector():
+    """
+    Weighted document for a job: title and company (A), category name (B),
+    description (C). Usable in .update() because the category name comes
+    from a subquery rather than a join.
+    """
+    category_name = Subquery(
+        JobCategory.objects.filter(pk=OuterRef("category_id")).values("name")[:1]
+    )
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("company", weight="A", config=SEARCH_CONFIG)
+        + SearchVector(Coalesce(category_name, Value("")), weight="B", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def refresh_search_vectors(queryset):
+    return queryset.update(search_vector=job_search_vector())
+
+
+def full_text_search(queryset, term):
+    """
+    Match `term` against the GIN-indexed search vector, best matches first.
+    """
+    query = SearchQuery(term, search_type="websearch", config=SEARCH_CONFIG)
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank", "-created_at", "-id")
+    )
+
+
+def fuzzy_search(queryset, term):
+    """
+    Typo-tolerant match on title and company using the trigram indexes,
+    closest matches first. The match threshold is the connection's
+    pg_trgm.word_similarity_threshold, see DATABASES in settings.
+    """
+    return (
+        queryset.filter(Q(title__trigram_word_similar=term) | Q(company__trigram_word_similar=term))
+        .annotate(similarity=Greatest(
+            TrigramWordSimilarity(term, "title"),
+            TrigramWordSimilarity(term, "company"),
+        ))
+        .order_by("-similarity", "-created_at", "-id")
+    )
+
+
+def suggest(term, limit=None):
+    """
+    "Did you mean" candidates: the distinct titles and company names
+    closest to `term`.
+    """
+    limit = limit or settings.JOB_SEARCH["SUGGESTION_LIMIT"]
+
+    candidates = []
+    for field in ("title", "company"):
+        rows = (
+            Job.objects.active().filter(**{f"{field}__trigram_word_similar": term})
+            .values(field)
+            .annotate(similarity=Max(TrigramWordSimilarity(term, field)))
+            .order_by("-similarity")[:limit]
+        )
+        candidates.extend((row["similarity"], row[field]) for row in rows)
+
+    suggestions = []
+    for _, value in sorted(candidates, key=lambda c: c[0], reverse=True):
+        if value.lower() != term.lower() and value not in suggestions:
+            suggestions.append(value)
+    return suggestions[:limit]
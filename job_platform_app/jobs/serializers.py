@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from common.serializers import SparseFieldsetMixin
 from .models import Job, JobCategory
 
 
@@ -8,7 +9,7 @@ class JobCategorySerializer(serializers.ModelSerializer):
         fields = ["id", "name", "slug"]
 
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category = JobCategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
         source="category",
@@ -33,7 +34,30 @@ class JobSerializer(serializers.ModelSerializer):
             "category",
             "category_id",
             "posted_by",
+            "status",
+            "expires_at",
+            "duplicate_of",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["posted_by", "latitude", "longitude"]
+        # no view_count: it changes without touching updated_at or the cache
+        # generation, so it would go stale behind ETags and cached lists
+        read_only_fields = ["posted_by", "latitude", "longitude", "duplicate_of"]
+
+
+class JobSummarySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Compact list representation: what a job card renders, no description.
+    """
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "title",
+            "company",
+            "location",
+            "salary_min",
+            "salary_max",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,168 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+from common.cache import bump_generation
+from common.pagination import pk_batches
+from locations.models import City
+
+from .models import Job, JobCategory
+from .search import SEARCH_FIELDS, refresh_search_vectors
+from .autocomplete import adjust_weights, job_terms, sync_city_terms
+from .recommendations import VECTOR_FIELDS, forget_job_vectors, refresh_job_vectors
+from .similarity import SIGNATURE_FIELDS, refresh_signatures
+from .duplicates import fingerprint
+
+
+# sent after a bulk_create of jobs (which skips post_save), with `pks`
+jobs_imported = Signal()
+
+
+# the fields the search/recommendation/similarity indexes and the
+# autocomplete terms are built from
+INDEXED_FIELDS = ("title", "company", "location", "description", "category_id")
+
+
+@receiver(pre_save, sender=Job)
+def remember_indexed_values(sender, instance, update_fields=None, **kwargs):
+    # what the row held before this save, so the receivers below can skip
+    # recomputing what didn't change; None for new rows
+    instance._previous_values = None
+    if instance._state.adding or (update_fields and not {
+        Job._meta.get_field(name).attname for name in update_fields
+    }.intersection(INDEXED_FIELDS)):
+        return
+    instance._previous_values = Job.objects.filter(pk=instance.pk).values(*INDEXED_FIELDS, "search_vector").first()
+    if instance._previous_values is not None and not _changed(instance, SEARCH_FIELDS, update_fields):
+        # a full save writes the column too, so carry the stored document over
+        instance.search_vector = instance._previous_values["search_vector"]
+
+
+def _changed(instance, fields, update_fields):
+    """
+    Whether this save touched any of `fields` (names or attnames).
+    """
+    if update_fields and not fields.intersection(update_fields):
+        return False
+    previous = getattr(instance, "_previous_values", None)
+    if previous is None:
+        return True
+    return any(
+        previous[attname] != getattr(instance, attname)
+        for attname in (Job._meta.get_field(name).attname for name in fields)
+    )
+
+
+@receiver(pre_save, sender=Job)
+def set_fingerprint(sender, instance, **kwargs):
+    instance.fingerprint = fingerprint(instance.title, instance.company, instance.location, instance.description)
+
+
+@receiver(post_save, sender=Job)
+def update_search_vector(sender, instance, update_fields=None, **kwargs):
+    if _changed(instance, SEARCH_FIELDS, update_fields):
+        refresh_search_vectors(Job.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Job)
+def update_job_vector(sender, instance, update_fields=None, **kwargs):
+    if _changed(instance, VECTOR_FIELDS, update_fields):
+        refresh_job_vectors([instance.pk])
+
+
+@receiver(post_save, sender=Job)
+def update_job_signature(sender, instance, update_fields=None, **kwargs):
+    # deletes cascade to the signature and buckets
+    if _changed(instance, SIGNATURE_FIELDS, update_fields):
+        refresh_signatures([instance.pk])
+
+
+# the category name is part of every job's document and vector, so a
+# rename walks the category's jobs in bounded batches
+CATEGORY_BATCH_SIZE = 1000
+
+
+@receiver(pre_save, sender=JobCategory)
+def remember_category_name(sender, instance, update_fields=None, **kwargs):
+    instance._previous_name = None
+    if not instance._state.adding and (not update_fields or "name" in update_fields):
+        instance._previous_name = JobCategory.objects.filter(pk=instance.pk).values_list("name", flat=True).first()
+
+
+def _renamed(instance, created, update_fields):
+    if created or (update_fields and "name" not in update_fields):
+        return False
+    return getattr(instance, "_previous_name", None) != instance.name
+
+
+@receiver(post_save, sender=JobCategory)
+def update_category_search_vectors(sender, instance, created, update_fields=None, **kwargs):
+    if _renamed(instance, created, update_fields):
+        for batch in pk_batches(Job.objects.filter(category=instance), CATEGORY_BATCH_SIZE):
+            refresh_search_vectors(Job.objects.filter(pk__in=batch))
+
+
+@receiver(post_save, sender=JobCategory)
+def update_category_job_vectors(sender, instance, created, update_fields=None, **kwargs):
+    if _renamed(instance, created, update_fields):
+        for batch in pk_batches(Job.objects.filter(category=instance), CATEGORY_BATCH_SIZE):
+            refresh_job_vectors(batch)
+
+
+@receiver(post_delete, sender=Job)
+def forget_job_vector(sender, instance, **kwargs):
+    # the vector row goes with the job; tell the in-memory indexes
+    forget_job_vectors([instance.pk])
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=JobCategory)
+@receiver(post_delete, sender=JobCategory)
+def invalidate_cached_reads(sender, **kwargs):
+    bump_generation(sender)
+
+
+@receiver(jobs_imported, sender=Job)
+def index_imported_jobs(sender, pks, **kwargs):
+    refresh_search_vectors(Job.objects.filter(pk__in=pks))
+    refresh_job_vectors(pks)
+    refresh_signatures(pks)
+    bump_generation(Job)
+
+    rows = Job.objects.filter(pk__in=pks).values_list("title", "company", "location")
+    adjust_weights(Counter(term for row in rows for term in job_terms(*row)))
+
+
+AUTOCOMPLETE_FIELDS = {"title", "company", "location"}
+
+
+@receiver(post_save, sender=Job)
+def update_autocomplete_terms(sender, instance, created, update_fields=None, **kwargs):
+    if not created and not _changed(instance, AUTOCOMPLETE_FIELDS, update_fields):
+        return
+    deltas = Counter(job_terms(instance.title, instance.company, instance.location))
+    # move the weight off the terms the row had before this save
+    previous = getattr(instance, "_previous_values", None)
+    if previous is not None:
+        deltas.subtract(job_terms(previous["title"], previous["company"], previous["location"]))
+    if any(deltas.values()):
+        adjust_weights(deltas)
+
+
+@receiver(post_delete, sender=Job)
+def remove_autocomplete_terms(sender, instance, **kwargs):
+    adjust_weights(Counter({term: -1 for term in job_terms(instance.title, instance.company, instance.location)}))
+
+
+@receiver(pre_save, sender=City)
+def remember_city_name(sender, instance, **kwargs):
+    instance._previous_name = None
+    if not instance._state.adding:
+        instance._previous_name = City.objects.filter(pk=instance.pk).values_list("name", flat=True).first()
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+def update_city_terms(sender, instance, **kwargs):
+    sync_city_terms([instance.name, getattr(instance, "_previous_name", None)])
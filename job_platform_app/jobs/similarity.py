@@ -0,0 +1,123 @@
+import functools
+import hashlib
+import zlib
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Subquery
+
+from .models import Job, JobLSHBucket, JobSignature
+from .text import tokens
+
+
+# fields that feed the MinHash signatures
+SIGNATURE_FIELDS = {"title", "description"}
+
+_PRIME = (1 << 31) - 1
+_SEED = 1729
+
+
+@functools.lru_cache
+def _permutations(count):
+    # fixed seed: signatures are compared across processes and deploys
+    rng = np.random.default_rng(_SEED)
+    return (
+        rng.integers(1, _PRIME, count, dtype=np.uint64),
+        rng.integers(0, _PRIME, count, dtype=np.uint64),
+    )
+
+
+def shingles(title, description):
+    words = tokens(f"{title} {description}")
+    size = settings.SIMILAR_JOBS["SHINGLE_SIZE"]
+    if len(words) < size:
+        return set(words)
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(shingle_set):
+    """
+    MinHash signature (BANDS * ROWS uint32 values) of a set of shingles,
+    or None for an empty set. The share of equal positions between two
+    signatures estimates the Jaccard similarity of the sets.
+    """
+    if not shingle_set:
+        return None
+    options = settings.SIMILAR_JOBS
+    a, b = _permutations(options["BANDS"] * options["ROWS"])
+    values = np.fromiter(
+        (zlib.crc32(shingle.encode()) for shingle in shingle_set), dtype=np.uint64, count=len(shingle_set)
+    )
+    # (a * x + b) mod p stays below 2**63 for 32-bit x and 31-bit a, b
+    return ((np.outer(values, a) + b) % _PRIME).min(axis=0).astype(np.uint32)
+
+
+def band_keys(signature):
+    """
+    One LSH bucket key per band; jobs sharing any key are candidates.
+    """
+    rows = settings.SIMILAR_JOBS["ROWS"]
+    keys = []
+    for band in range(len(signature) // rows):
+        digest = hashlib.blake2b(
+            signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8, person=band.to_bytes(2, "big")
+        ).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def refresh_signatures(pks):
+    """
+    Recompute the signatures and LSH buckets of these jobs.
+    """
+    pks = list(pks)
+    signatures, buckets = [], []
+    for pk, title, description in Job.objects.filter(pk__in=pks).values_list("pk", "title", "description"):
+        signature = minhash(shingles(title, description))
+        if signature is None:
+            continue
+        signatures.append(JobSignature(job_id=pk, signature=signature.tobytes()))
+        buckets.extend(JobLSHBucket(job_id=pk, key=key) for key in band_keys(signature))
+
+    with transaction.atomic():
+        JobSignature.objects.filter(job__in=pks).delete()
+        JobLSHBucket.objects.filter(job__in=pks).delete()
+        JobSignature.objects.bulk_create(signatures)
+        JobLSHBucket.objects.bulk_create(buckets)
+    return len(signatures)
+
+
+def similar_jobs(job, limit=None):
+    """
+    Active jobs whose title and description resemble `job`'s, as (job,
+    similarity) pairs, best first. Only jobs sharing an LSH bucket are
+    compared, and at most CANDIDATE_LIMIT of them, so the cost doesn't
+    grow with the table.
+    """
+    options = settings.SIMILAR_JOBS
+    limit = min(limit or options["LIMIT"], options["MAX_LIMIT"])
+
+    own_keys = JobLSHBucket.objects.filter(job=job).values("key")
+    candidates = list(
+        JobLSHBucket.objects.filter(key__in=Subquery(own_keys)).exclude(job=job)
+        .values("job").annotate(shared=Count("id")).order_by("-shared")
+        .values_list("job", flat=True)[:options["CANDIDATE_LIMIT"]]
+    )
+    if not candidates:
+        return []
+
+    signatures = dict(JobSignature.objects.filter(job__in=[job.pk, *candidates]).values_list("job", "signature"))
+    if job.pk not in signatures:
+        return []
+    own = np.frombuffer(signatures.pop(job.pk), dtype=np.uint32)
+
+    scored = []
+    for pk, signature in signatures.items():
+        similarity = float(np.mean(np.frombuffer(signature, dtype=np.uint32) == own))
+        if similarity >= options["THRESHOLD"]:
+            scored.append((similarity, pk))
+    scored.sort(key=lambda item: item[0], reverse=True)
+
+    jobs = Job.objects.active().select_related("category").in_bulk([pk for _, pk in scored[:limit * 2]])
+    return [(jobs[pk], similarity) for similarity, pk in scored if pk in jobs][:limit]
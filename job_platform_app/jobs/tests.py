@@ -1,17 +1,42 @@
+import io
+import json
+import tempfile
+import uuid
+from datetime import timedelta
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from graphene_django.utils.testing import GraphQLTestCase
 from job_platform.schema import schema
 
-from .models import Job, JobCategory
+from locations.models import City, Country, State
+from .duplicates import fingerprint
+from .importers import import_jobs
+from .models import Job, JobCategory, JobLSHBucket, SearchTerm
+from .popularity import job_views
+from .recommendations import job_vector_index
+from .trending import refresh_trending_scores
+from .serializers import JobSerializer, JobSummarySerializer
+from common import fastpath
 
 User = get_user_model()
 
 
 class JobsAPITest(APITestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(email="user@example.com", password="userpass", role="user")
         self.admin = User.objects.create_user(email="admin@example.com", password="adminpass", role="admin", is_staff=True)
 
@@ -78,6 +103,62 @@ class JobsAPITest(APITestCase):
         resp = self.client.delete(detail, **headers)
         self.assertIn(resp.status_code, (status.HTTP_204_NO_CONTENT, status.HTTP_200_OK))
 
+    def test_duplicate_postings(self):
+        list_url = reverse("job-list")
+        headers = self.auth_headers("admin@example.com", "adminpass")
+        # same posting as self.job up to case, spacing and punctuation
+        payload = {
+            "title": "backend  developer!", "description": "Work with Django.", "company": "ACME",
+            "location": "Lagos, NG", "job_type": "full-time", "category_id": str(self.cat.id),
+        }
+
+        resp = self.client.post(list_url, payload, format="json", **headers)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.data["duplicate_of"], str(self.job.id))
+
+        with override_settings(JOB_DUPLICATES={"POLICY": "merge"}):
+            Job.objects.filter(pk=self.job.pk).update(expires_at=timezone.now() + timedelta(days=1))
+            resp = self.client.post(list_url, payload, format="json", **headers)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["id"], str(self.job.id))
+        self.job.refresh_from_db()
+        self.assertGreater(self.job.expires_at, timezone.now() + timedelta(days=30))
+
+        with override_settings(JOB_DUPLICATES={"POLICY": "flag"}):
+            resp = self.client.post(list_url, payload, format="json", **headers)
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["duplicate_of"], self.job.id)
+
+        # a different posting goes through; closed ones don't count
+        payload["title"] = "Frontend Developer"
+        resp = self.client.post(list_url, payload, format="json", **headers)
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        Job.objects.filter(pk=resp.data["id"]).update(status="closed")
+        resp = self.client.post(list_url, payload, format="json", **headers)
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        # bulk imports check the table and the feed itself
+        rows = [
+            {"title": "Backend Developer", "description": "Work with Django", "company": "Acme",
+             "location": "Lagos, NG", "job_type": "full-time"},
+            {"title": "Data Engineer", "description": "Pipelines", "company": "Acme", "location": "Remote",
+             "job_type": "full-time"},
+            {"title": "Data  Engineer", "description": "Pipelines.", "company": "acme", "location": "Remote",
+             "job_type": "full-time"},
+        ]
+        result = import_jobs(enumerate(rows, start=1), self.admin)
+        self.assertEqual((result.created, result.failed), (1, 2))
+        with override_settings(JOB_DUPLICATES={"POLICY": "merge"}):
+            result = import_jobs(enumerate(rows, start=1), self.admin)
+        self.assertEqual((result.created, result.merged), (0, 3))
+
+    def test_fingerprint_normalization_is_stable(self):
+        # stored in Job.fingerprint; a new value here means existing rows need a backfill
+        self.assertEqual(
+            fingerprint("Senior Django Dev!", "ACME, Inc.", "Lagos", "We are the best; a C++ & C# shop with you"),
+            "a704e77f848ad0b0533634f8a45659a1c76699d1",
+        )
+
     def test_search_and_filters(self):
         list_url = reverse("job-list")
         resp = self.client.get(list_url + "?search=Backend")
@@ -85,6 +166,587 @@ class JobsAPITest(APITestCase):
         resp = self.client.get(list_url + f"?category={str(self.cat.id)}&job_type=full-time")
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
 
+    def test_full_text_search_ranks_title_matches_first(self):
+        Job.objects.create(
+            title="Django Engineer", description="Python services",
+            company="Initech", location="Remote", job_type="contract",
+            category=self.cat, posted_by=self.admin
+        )
+
+        resp = self.client.get(reverse("job-list") + "?search=django")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        titles = [job["title"] for job in resp.data["results"]]
+        self.assertEqual(titles, ["Django Engineer", "Backend Developer"])
+
+        # category names are searchable and renames are picked up
+        self.cat.name = "Fintech"
+        self.cat.save()
+        resp = self.client.get(reverse("job-list") + "?search=fintech")
+        self.assertEqual(resp.data["count"], 2)
+
+        # other category edits leave the jobs alone
+        self.cat.slug = "fintech"
+        with CaptureQueriesContext(connection) as ctx:
+            self.cat.save()
+        indexes = ("jobs_jobvector", "to_tsvector")
+        self.assertFalse([q["sql"] for q in ctx.captured_queries if any(name in q["sql"] for name in indexes)])
+
+        resp = self.client.get(reverse("job-list") + "?search=plumber")
+        self.assertEqual(resp.data["count"], 0)
+
+    def test_fuzzy_search_tolerates_typos(self):
+        Job.objects.create(
+            title="Django Developer", description="APIs", company="Initech",
+            location="Remote", job_type="contract", category=self.cat, posted_by=self.admin
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("job-list") + "?search=Djnago developer&search_mode=fuzzy")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        # the threshold comes with the connection, not per request
+        self.assertFalse([q for q in ctx.captured_queries if "set_config" in q["sql"]])
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW pg_trgm.word_similarity_threshold")
+            self.assertEqual(float(cursor.fetchone()[0]), settings.JOB_SEARCH["TRIGRAM_THRESHOLD"])
+        self.assertEqual(resp.data["results"][0]["title"], "Django Developer")
+        self.assertIn("Django Developer", resp.data["suggestions"])
+
+        # the exact search finds nothing for the typo
+        resp = self.client.get(reverse("job-list") + "?search=Djnago")
+        self.assertEqual(resp.data["count"], 0)
+
+    def test_rebuild_search_vectors_command(self):
+        Job.objects.update(search_vector=None)
+        call_command("rebuild_search_vectors", batch_size=1, stdout=io.StringIO())
+
+        resp = self.client.get(reverse("job-list") + "?search=acme")
+        self.assertEqual(resp.data["count"], 1)
+
+    def test_autocomplete(self):
+        state = State.objects.create(country=Country.objects.create(name="Nigeria"), name="Lagos State")
+        City.objects.create(state=state, name="Lagos")
+        for company in ("Acme", "Globex"):
+            Job.objects.create(
+                title="Backend  engineer", description="d", company=company, location="Remote",
+                job_type="full-time", category=self.cat, posted_by=self.admin
+            )
+        url = reverse("job-autocomplete")
+
+        resp = self.client.get(url + "?q=BACK")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(r["label"], r["weight"]) for r in resp.data["results"]],
+            [("Backend  engineer", 2), ("Backend Developer", 1)],
+        )
+        resp = self.client.get(url + "?q=la&kind=city,company")
+        self.assertEqual(resp.data["results"], [{"kind": "city", "label": "Lagos", "weight": 1}])
+        resp = self.client.get(url + "?q=a&kind=salary")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # weights follow edits and deletes
+        self.job.title = "Frontend Developer"
+        self.job.location = "Remote"
+        self.job.save()
+        Job.objects.get(company="Globex").delete()
+        weights = dict(SearchTerm.objects.values_list("term", "weight"))
+        self.assertEqual(weights["backend engineer"], 1)
+        self.assertEqual(weights["frontend developer"], 1)
+        self.assertEqual(weights["lagos"], 0)
+        self.assertNotIn("backend developer", weights)
+        self.assertNotIn("globex", weights)
+
+        # a rebuild lands on the same rows
+        incremental = set(SearchTerm.objects.values_list("kind", "term", "weight"))
+        call_command("rebuild_autocomplete", stdout=io.StringIO())
+        self.assertEqual(set(SearchTerm.objects.values_list("kind", "term", "weight")), incremental)
+
+    def test_bulk_import_endpoint(self):
+        feed = (
+            "title,description,company,location,job_type,category,salary_min\n"
+            "Rust Engineer,Systems work,Ferrous,Remote,full-time,tech,90000\n"
+            "Chef,Cooking,Diner,Lagos,full-time,kitchen,\n"
+            "Tester,QA,Acme,Remote,gig,,\n"
+        )
+        upload = SimpleUploadedFile("feed.csv", feed.encode(), content_type="text/csv")
+        url = reverse("job-import")
+
+        resp = self.client.post(url, {"file": upload}, **self.auth_headers("user@example.com", "userpass"))
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+        upload.seek(0)
+        resp = self.client.post(url, {"file": upload}, **self.auth_headers("admin@example.com", "adminpass"))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["created"], 1)
+        self.assertEqual(resp.data["failed"], 2)
+        self.assertEqual([e["line"] for e in resp.data["errors"]], [3, 4])
+        self.assertIn("category", resp.data["errors"][0]["errors"])
+        self.assertIn("job_type", resp.data["errors"][1]["errors"])
+
+        job = Job.objects.get(title="Rust Engineer")
+        self.assertEqual((job.category, job.posted_by), (self.cat, self.admin))
+        # bulk-created rows are indexed for search too
+        resp = self.client.get(reverse("job-list") + "?search=ferrous")
+        self.assertEqual(resp.data["count"], 1)
+
+    def test_import_jobs_command(self):
+        rows = [
+            {"title": f"Job {i}", "description": "d", "company": "Feed", "location": "Remote",
+             "job_type": "contract", "category": "tech"}
+            for i in range(5)
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl") as feed:
+            feed.write("\n".join(json.dumps(row) for row in rows) + "\nnot json\n")
+            feed.flush()
+            err = io.StringIO()
+            call_command(
+                "import_jobs", feed.name, posted_by="admin@example.com",
+                batch_size=2, stdout=io.StringIO(), stderr=err,
+            )
+
+        self.assertEqual(Job.objects.filter(company="Feed", category=self.cat).count(), 5)
+        self.assertIn("line 6", err.getvalue())
+
+    def test_streaming_export(self):
+        url = reverse("job-export")
+        resp = self.client.get(url, **self.auth_headers("user@example.com", "userpass"))
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+        headers = self.auth_headers("admin@example.com", "adminpass")
+        resp = self.client.get(url, **headers)
+        self.assertTrue(resp.streaming)
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["id", "title", "description"])
+        self.assertEqual(len(lines), 2)
+        self.assertIn("admin@example.com", lines[1])
+
+        resp = self.client.get(url + "?export_format=jsonl", **headers)
+        row = json.loads(b"".join(resp.streaming_content))
+        self.assertEqual((row["id"], row["category"]), (str(self.job.id), "tech"))
+
+        out = io.StringIO()
+        call_command("export_jobs", format="jsonl", chunk_size=1, stdout=out)
+        self.assertEqual(json.loads(out.getvalue()), row)
+
+    def test_lists_default_to_active_jobs(self):
+        past = timezone.now() - timedelta(days=1)
+        closed = Job.objects.create(
+            title="Closed Role", description="d", company="Acme", location="Remote",
+            job_type="full-time", category=self.cat, posted_by=self.admin, status="closed",
+        )
+        overdue = Job.objects.create(
+            title="Overdue Role", description="d", company="Acme", location="Remote",
+            job_type="full-time", category=self.cat, posted_by=self.admin, expires_at=past,
+        )
+        self.assertIsNotNone(self.job.expires_at)
+
+        url = reverse("job-list")
+        ids = lambda resp: {job["id"] for job in resp.data["results"]}
+        resp = self.client.get(url)
+        self.assertEqual(ids(resp), {str(self.job.id)})
+        self.assertEqual(self.client.get(reverse("job-facets")).data["count"], 1)
+        self.assertEqual(ids(self.client.get(url + "?status=closed")), {str(closed.id)})
+        self.assertEqual(len(self.client.get(url + "?status=all").data["results"]), 3)
+        self.assertEqual(self.client.get(url + "?status=bogus").status_code, status.HTTP_400_BAD_REQUEST)
+        # closed postings are still reachable directly
+        resp = self.client.get(reverse("job-detail", kwargs={"pk": str(closed.id)}))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        detail_url = reverse("job-detail", kwargs={"pk": str(overdue.id)})
+        etag = self.client.get(detail_url)["ETag"]
+
+        # the archiver flips the overdue job and the cached lists notice
+        out = io.StringIO()
+        call_command("expire_jobs", stdout=out)
+        self.assertIn("Expired 1 jobs.", out.getvalue())
+        overdue.refresh_from_db()
+        self.assertEqual(overdue.status, "expired")
+        self.assertEqual(closed.status, "closed")
+        self.assertEqual(ids(self.client.get(url + "?status=expired")), {str(overdue.id)})
+        # and so does the detail ETag
+        resp = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["status"], "expired")
+
+    def test_recommended_jobs(self):
+        url = reverse("job-recommended")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        headers = self.auth_headers("user@example.com", "userpass")
+        # nothing to match on yet
+        self.assertEqual(self.client.get(url, **headers).data["results"], [])
+
+        design = JobCategory.objects.create(name="Design", slug="design")
+        designer = Job.objects.create(
+            title="Graphic Designer", description="Figma, branding and illustration", company="Studio",
+            location="Remote", job_type="full-time", category=design, posted_by=self.admin,
+        )
+        Job.objects.create(
+            title="Senior Django Engineer", description="Python APIs", company="Acme", location="Remote",
+            job_type="full-time", category=self.cat, posted_by=self.admin, status="closed",
+        )
+        profile = self.user.profile
+        profile.headline = "Backend developer"
+        profile.bio = "Python and Django APIs"
+        profile.save()
+
+        resp = self.client.get(url, **headers)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        results = resp.data["results"]
+        # closed jobs aren't recommended, unrelated ones rank last if at all
+        self.assertEqual(results[0]["id"], str(self.job.id))
+        self.assertNotIn("Senior Django Engineer", [job["title"] for job in results])
+        self.assertGreater(results[0]["score"], 0)
+
+        # vectors follow job edits
+        designer.title = "Backend Developer (Python)"
+        designer.description = "Django APIs"
+        designer.save()
+        results = self.client.get(url + "?limit=1", **headers).data["results"]
+        self.assertEqual([job["id"] for job in results], [str(designer.id)])
+
+        # and deleted jobs leave the in-memory index on the next sync, from
+        # their tombstones rather than a scan of every stored key
+        designer.delete()
+        with CaptureQueriesContext(connection) as ctx:
+            job_vector_index.sync()
+        self.assertNotIn(designer.id, job_vector_index.rows)
+        vector_reads = [q["sql"] for q in ctx.captured_queries if 'FROM "jobs_jobvector"' in q["sql"]]
+        self.assertTrue(all("updated_at" in sql for sql in vector_reads), vector_reads)
+        self.assertTrue([q for q in ctx.captured_queries if "jobs_jobvectortombstone" in q["sql"]])
+        self.assertEqual(len(job_vector_index.ids), job_vector_index.matrix.shape[0])
+
+    def test_unindexed_edits_skip_the_index_updates(self):
+        indexes = ("jobs_jobvector", "jobs_jobsignature", "jobs_joblshbucket", "to_tsvector")
+        self.job.salary_min = 90000
+        with CaptureQueriesContext(connection) as ctx:
+            self.job.save()
+        self.assertFalse([q["sql"] for q in ctx.captured_queries if any(name in q["sql"] for name in indexes)])
+        # the full save kept the stored search document
+        self.assertTrue(Job.objects.filter(pk=self.job.pk, search_vector="django").exists())
+
+        # saving the same text again doesn't count as a change either
+        self.job.title = self.job.title
+        with CaptureQueriesContext(connection) as ctx:
+            self.job.save(update_fields=["title"])
+        self.assertFalse([q["sql"] for q in ctx.captured_queries if any(name in q["sql"] for name in indexes)])
+
+        self.job.title = "Python Developer"
+        with CaptureQueriesContext(connection) as ctx:
+            self.job.save()
+        self.assertTrue([q["sql"] for q in ctx.captured_queries if "jobs_jobvector" in q["sql"]])
+
+    def test_similar_jobs(self):
+        description = "Build and maintain Django REST APIs, write tests and review pull requests with the team"
+        self.job.description = description
+        self.job.save()
+        twin = Job.objects.create(
+            title="Backend Developer", description=description + " in Lagos", company="Other Co",
+            location="Remote", job_type="full-time", category=self.cat, posted_by=self.admin,
+        )
+        Job.objects.create(
+            title="Backend Developer", description=description, company="Gone",
+            location="Remote", job_type="full-time", category=self.cat, posted_by=self.admin, status="closed",
+        )
+        Job.objects.create(
+            title="Graphic Designer", description="Branding, Figma and illustration work", company="Studio",
+            location="Remote", job_type="full-time", category=self.cat, posted_by=self.admin,
+        )
+
+        url = reverse("job-similar", kwargs={"pk": str(self.job.id)})
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([job["id"] for job in resp.data["results"]], [str(twin.id)])
+        self.assertGreater(resp.data["results"][0]["similarity"], 0.5)
+
+        # the index follows edits and deletes
+        twin.description = "Figma branding and illustration"
+        twin.save()
+        self.assertEqual(self.client.get(url).data["results"], [])
+        twin.delete()
+        self.assertFalse(JobLSHBucket.objects.filter(job_id=twin.id).exists())
+
+    @override_settings(JOB_VIEWS={"FLUSH_INTERVAL": 0, "MAX_PENDING": 10000})
+    def test_view_counts_are_buffered(self):
+        detail = reverse("job-detail", kwargs={"pk": str(self.job.id)})
+        job_views.flush()
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(3):
+                self.assertEqual(self.client.get(detail).status_code, status.HTTP_200_OK)
+        # nothing written while serving
+        self.assertFalse([q for q in ctx.captured_queries if not q["sql"].startswith("SELECT")])
+        self.client.get(reverse("job-detail", kwargs={"pk": str(uuid.uuid4())}))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.view_count, 0)
+
+        # one multi-row UPDATE per flush
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(job_views.flush(), 3)
+        self.assertEqual(len([q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]), 1)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.view_count, 3)
+        self.assertEqual(job_views.flush(), 0)
+        # the cached REST representation leaves the live counter out
+        self.assertNotIn("view_count", self.client.get(detail).data)
+
+    @override_settings(JOB_VIEWS={"FLUSH_INTERVAL": 0, "MAX_PENDING": 10000})
+    def test_trending_ordering(self):
+        from applications.models import Application
+
+        def make(title):
+            return Job.objects.create(
+                title=title, description="d", company="Acme", location="Remote",
+                job_type="full-time", category=self.cat, posted_by=self.admin,
+            )
+
+        applied, viewed = make("Applied"), make("Viewed")
+        for applicant in (self.user, self.admin):
+            Application.objects.create(job=applied, applicant=applicant, resume="resumes/cv.pdf")
+        job_views.flush()
+        for _ in range(3):
+            self.client.get(reverse("job-detail", kwargs={"pk": str(viewed.id)}))
+        job_views.flush()
+
+        out = io.StringIO()
+        call_command("refresh_trending", stdout=out)
+        self.assertIn("Updated 2 trending scores", out.getvalue())
+        url = reverse("job-list") + "?ordering=trending"
+        titles = lambda: [job["title"] for job in self.client.get(url).data["results"]]
+        # 2 applications outweigh 3 views; no activity, not trending
+        self.assertEqual(titles(), ["Applied", "Viewed"])
+
+        # two days on, one fresh application beats two old ones
+        later = timezone.now() + timedelta(days=2)
+        Application.objects.create(job=self.job, applicant=self.user, resume="resumes/cv.pdf")
+        Application.objects.filter(job=self.job).update(created_at=later - timedelta(hours=1))
+        refresh_trending_scores(now=later)
+        self.assertEqual(titles(), ["Backend Developer", "Applied", "Viewed"])
+
+        # and everything fades out eventually
+        self.assertEqual(refresh_trending_scores(now=later + timedelta(days=30)), (0, 3))
+        self.assertEqual(titles(), [])
+
+    def test_facets_match_the_filtered_list(self):
+        other = JobCategory.objects.create(name="Design", slug="design")
+        Job.objects.create(
+            title="Product Designer", description="Figma", company="Acme", location="Remote",
+            job_type="contract", category=other, salary_min="60000.00", posted_by=self.admin
+        )
+        Job.objects.create(
+            title="Django Intern", description="Learn Django", company="Acme", location="Remote",
+            job_type="internship", category=self.cat, posted_by=self.admin
+        )
+
+        resp = self.client.get(reverse("job-facets"))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["count"], 3)
+        job_types = {f["value"]: f["count"] for f in resp.data["job_type"]}
+        self.assertEqual(job_types["full-time"], 1)
+        self.assertEqual(job_types["remote"], 0)
+        categories = {f["slug"]: f["count"] for f in resp.data["category"]}
+        self.assertEqual(categories, {"tech": 2, "design": 1})
+        bands = {f["value"]: f["count"] for f in resp.data["salary_band"]}
+        self.assertEqual(bands["50k-100k"], 2)
+        self.assertEqual(bands["unspecified"], 1)
+
+        # same search and filters as the list
+        query = f"?search=django&category={self.cat.id}"
+        facets = self.client.get(reverse("job-facets") + query).data
+        listing = self.client.get(reverse("job-list") + query).data
+        self.assertEqual(facets["count"], listing["count"])
+
+        resp = self.client.get(reverse("job-list") + "?salary_band=50k-100k")
+        self.assertEqual(resp.data["count"], bands["50k-100k"])
+
+    def test_radius_search(self):
+        # Lagos, Ibadan (~115 km away) and Nairobi
+        for title, lat, lng in [("Lagos", "6.524400", "3.379200"),
+                                ("Ibadan", "7.377500", "3.947000"),
+                                ("Nairobi", "-1.292100", "36.821900")]:
+            Job.objects.create(
+                title=title, description="d", company="Acme", location=title,
+                job_type="full-time", category=self.cat, latitude=lat, longitude=lng,
+                posted_by=self.admin
+            )
+
+        resp = self.client.get(reverse("job-list") + "?near=6.45,3.39&radius_km=25")
+        self.assertEqual([job["title"] for job in resp.data["results"]], ["Lagos"])
+
+        resp = self.client.get(reverse("job-list") + "?near=7.4,3.9&radius_km=200&ordering=distance")
+        self.assertEqual([job["title"] for job in resp.data["results"]], ["Ibadan", "Lagos"])
+
+        resp = self.client.get(reverse("job-list") + "?near=somewhere")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_anonymous_reads_are_cached_until_a_write(self):
+        list_url = reverse("job-list")
+        resp = self.client.get(list_url + "?job_type=full-time")
+        self.assertEqual(resp["X-Cache"], "MISS")
+
+        # same params in another order: served without touching the database
+        with self.assertNumQueries(0):
+            resp = self.client.get(list_url + "?job_type=full-time&search=")
+        self.assertEqual(resp["X-Cache"], "HIT")
+        self.assertEqual(resp.data["count"], 1)
+
+        # any job or category write retires the cached pages
+        Job.objects.create(
+            title="Second", description="d", company="Acme", location="Remote",
+            job_type="full-time", category=self.cat, posted_by=self.admin
+        )
+        resp = self.client.get(list_url + "?job_type=full-time")
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(resp.data["count"], 2)
+
+        facets_url = reverse("job-facets")
+        self.assertEqual(self.client.get(facets_url)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(facets_url)["X-Cache"], "HIT")
+
+        self.cat.name = "Renamed"
+        self.cat.save()
+        detail = self.client.get(reverse("job-detail", kwargs={"pk": str(self.job.id)}))
+        self.assertEqual(detail.data["category"]["name"], "Renamed")
+
+        # authenticated requests bypass the cache
+        headers = self.auth_headers("user@example.com", "userpass")
+        resp = self.client.get(list_url, **headers)
+        self.assertNotIn("X-Cache", resp)
+
+    def test_conditional_get(self):
+        detail = reverse("job-detail", kwargs={"pk": str(self.job.id)})
+        resp = self.client.get(detail)
+        etag, last_modified = resp["ETag"], resp["Last-Modified"]
+
+        resp = self.client.get(detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        resp = self.client.get(detail, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        list_url = reverse("job-list")
+        list_etag = self.client.get(list_url)["ETag"]
+        resp = self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # an edit changes both validators
+        self.job.title = "Senior Backend Developer"
+        self.job.save()
+        resp = self.client.get(detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(resp["ETag"], etag)
+        resp = self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_sparse_fieldsets_and_summary_view(self):
+        list_url = reverse("job-list")
+
+        resp = self.client.get(list_url + "?fields=id,title,category")
+        self.assertEqual(list(resp.data["results"][0]), ["id", "title", "category"])
+
+        resp = self.client.get(list_url + "?omit=description,full_location")
+        self.assertNotIn("description", resp.data["results"][0])
+        self.assertIn("salary_min", resp.data["results"][0])
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(list_url + "?view=summary")
+        self.assertEqual(
+            list(resp.data["results"][0]),
+            ["id", "title", "company", "location", "salary_min", "salary_max"],
+        )
+        # the description column isn't even loaded
+        self.assertFalse(any('"description"' in q["sql"] for q in ctx.captured_queries))
+
+    def test_fast_list_path_matches_the_serializer(self):
+        Job.objects.create(
+            title="Data Analyst", description="SQL", company="Beta", location="Remote",
+            job_type="contract", category=None, salary_min=None, posted_by=self.admin
+        )
+        jobs = Job.objects.order_by("-created_at", "-id")
+
+        for query, serializer_class in (("", JobSerializer), ("?view=summary", JobSummarySerializer)):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(reverse("job-list") + query)
+            expected = serializer_class(jobs, many=True, context={"request": Request(resp.wsgi_request)}).data
+            self.assertEqual(
+                JSONRenderer().render(resp.data["results"]),
+                JSONRenderer().render(expected),
+            )
+            # count estimate and exact count, then one values() query with
+            # the category joined in (the ETag comes from generations)
+            self.assertEqual(len(ctx.captured_queries), 3)
+
+    def test_fast_list_plans_are_bounded(self):
+        # every ?fields= combination compiles its own plan; old ones get evicted
+        with mock.patch.object(fastpath, "PLAN_CACHE_SIZE", 2):
+            for fields in ("id", "id,title", "id,title,company", "title"):
+                resp = self.client.get(reverse("job-list") + f"?fields={fields}")
+                self.assertEqual(list(resp.data["results"][0]), fields.split(","))
+            self.assertLessEqual(len(fastpath._plans), 2)
+
+    def test_cursor_pagination_walks_every_job_once(self):
+        for i in range(4):
+            Job.objects.create(
+                title=f"Job {i}", description="d", company="Acme", location="Remote",
+                job_type="part-time" if i % 2 else "full-time",
+                category=self.cat, posted_by=self.admin
+            )
+        expected = list(
+            Job.objects.filter(job_type="full-time")
+            .order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+        seen = []
+        url = reverse("job-list") + "?pagination=cursor&limit=1&job_type=full-time"
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", resp.data)
+            seen.extend(job["id"] for job in resp.data["results"])
+            last = resp.data
+            url = resp.data["next"]
+        self.assertEqual([str(pk) for pk in expected], seen)
+
+        # walking back from the last page returns the page before it
+        resp = self.client.get(last["previous"])
+        self.assertEqual([job["id"] for job in resp.data["results"]], seen[-2:-1])
+
+    def test_list_counts_are_cached_estimated_or_skipped(self):
+        url = reverse("job-list") + "?limit=1"
+        # authenticated, so the response cache stays out of the way
+        headers = self.auth_headers("user@example.com", "userpass")
+        Job.objects.create(
+            title="Job 2", description="d", company="Acme", location="Remote",
+            job_type="contract", category=self.cat, posted_by=self.admin
+        )
+
+        resp = self.client.get(url, **headers)
+        self.assertEqual(resp.data["count"], 2)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, **headers)
+        self.assertEqual(resp.data["count"], 2)
+        self.assertFalse(any("COUNT(" in q["sql"] for q in ctx.captured_queries))
+
+        # a write retires the cached count
+        Job.objects.create(
+            title="Job 3", description="d", company="Acme", location="Remote",
+            job_type="contract", category=self.cat, posted_by=self.admin
+        )
+        resp = self.client.get(url, **headers)
+        self.assertEqual(resp.data["count"], 3)
+        self.assertNotIn("count_estimated", resp.data)
+
+        resp = self.client.get(url + "&count=false&offset=1", **headers)
+        self.assertIsNone(resp.data["count"])
+        self.assertIn("offset=2", resp.data["next"])
+        resp = self.client.get(url + "&count=false&offset=2", **headers)
+        self.assertIsNone(resp.data["next"])
+
+        with override_settings(PAGINATION={"COUNT_ESTIMATE_THRESHOLD": 0, "COUNT_CACHE_TIMEOUT": 300}):
+            resp = self.client.get(url + "&job_type=contract", **headers)
+        self.assertTrue(resp.data["count_estimated"])
+        self.assertIsInstance(resp.data["count"], int)
+
+    def test_invalid_cursor(self):
+        resp = self.client.get(reverse("job-list") + "?cursor=not-a-cursor")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
 
 class TestGraphQLAPI(GraphQLTestCase):
     GRAPHQL_SCHEMA = schema
@@ -165,6 +827,173 @@ class TestGraphQLAPI(GraphQLTestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertContains(resp, 'postedBy')
 
+    def test_job_relations_are_batched(self):
+        token = self.get_token_for("user@example.com", "userpass")
+        headers = {"Authorization": f"JWT {token}"}
+        query = """
+            query { jobs { id category { name } postedBy { email profile { bio } } } }
+        """
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.query(query, headers=headers)
+            self.assertResponseNoErrors(resp)
+            return len(resp.json()["data"]["jobs"]), len(ctx.captured_queries)
+
+        few = count_queries()
+        for i in range(5):
+            # each job with its own category and poster
+            poster = User.objects.create_user(email=f"poster{i}@example.com", password="pass", role="admin")
+            category = JobCategory.objects.create(name=f"Category {i}", slug=f"category-{i}")
+            Job.objects.create(
+                title=f"Job {i}", description="desc", company="Acme", location="Remote",
+                job_type="full-time", category=category, posted_by=poster,
+            )
+        many = count_queries()
+
+        self.assertEqual((few[0], many[0]), (1, 6))
+        self.assertEqual(few[1], many[1])
+
+    def test_selection_decides_the_job_query(self):
+        token = self.get_token_for("user@example.com", "userpass")
+        headers = {"Authorization": f"JWT {token}"}
+
+        def job_queries(query):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.query(query, headers=headers)
+            self.assertResponseNoErrors(resp)
+            return [q["sql"] for q in ctx.captured_queries if 'FROM "jobs_job"' in q["sql"]]
+
+        # scalars only: just those columns, no joins
+        [sql] = job_queries("query { jobs { id title } }")
+        self.assertIn('"jobs_job"."title"', sql)
+        self.assertNotIn('"jobs_job"."description"', sql)
+        self.assertNotIn("JOIN", sql)
+
+        # relations, also through fragments, are joined into the same query
+        [sql] = job_queries("""
+            query { jobs { title category { name } ...card } }
+            fragment card on JobType { postedBy { email profile { bio } } }
+        """)
+        for column in ('"jobs_jobcategory"."name"', '"users_user"."email"', '"users_profile"."bio"'):
+            self.assertIn(column, sql)
+        self.assertNotIn('"jobs_job"."description"', sql)
+        self.assertNotIn('"users_user"."password"', sql)
+
+        [sql] = job_queries(f'query {{ job(id: "{self.job.pk}") {{ company similarJobs {{ id }} }} }}')
+        self.assertIn('"jobs_job"."company"', sql.split(" FROM ")[0])
+        self.assertNotIn('"jobs_job"."title"', sql.split(" FROM ")[0])
+
+    def test_jobs_connection_pages(self):
+        token = self.get_token_for("user@example.com", "userpass")
+        headers = {"Authorization": f"JWT {token}"}
+        for i in range(4):
+            Job.objects.create(
+                title=f"Job {i}", description="desc", company="Acme", location="Remote",
+                job_type="part-time" if i % 2 else "full-time", category=self.cat, posted_by=self.admin,
+            )
+        query = """
+            query page($first: Int, $after: String, $jobType: String) {
+                jobsConnection(first: $first, after: $after, jobType: $jobType) {
+                    edges { cursor node { id title } }
+                    pageInfo { hasNextPage hasPreviousPage endCursor }
+                }
+            }
+        """
+
+        def page(**variables):
+            resp = self.query(query, variables=variables, headers=headers)
+            self.assertResponseNoErrors(resp)
+            return resp.json()["data"]["jobsConnection"]
+
+        seen, after = [], None
+        while True:
+            data = page(first=2, after=after)
+            self.assertEqual(data["pageInfo"]["hasPreviousPage"], after is not None)
+            seen += [edge["node"]["id"] for edge in data["edges"]]
+            if not data["pageInfo"]["hasNextPage"]:
+                break
+            after = data["pageInfo"]["endCursor"]
+        newest_first = [str(pk) for pk in Job.objects.order_by("-created_at", "-id").values_list("pk", flat=True)]
+        self.assertEqual(seen, newest_first)
+
+        # REST list filters, and the server-side page size cap
+        self.assertEqual(len(page(jobType="part-time")["edges"]), 2)
+        with self.settings(PAGINATION={**settings.PAGINATION, "GRAPHQL_MAX_PAGE_SIZE": 3}):
+            data = page(first=1000)
+        self.assertEqual(len(data["edges"]), 3)
+        self.assertTrue(data["pageInfo"]["hasNextPage"])
+
+        resp = self.query(query, variables={"after": "nope"}, headers=headers)
+        self.assertResponseHasErrors(resp)
+
+    def test_fuzzy_search_jobs(self):
+        token = self.get_token_for("user@example.com", "userpass")
+
+        headers = {"Authorization": f"JWT {token}"}
+
+        query = '''
+            query searchJobs ($search: String!) {
+                jobs (search: $search, fuzzy: true) {
+                    title
+                }
+                jobSuggestions (term: $search)
+            }
+        '''
+
+        resp = self.query(
+            query,
+            variables={"search": "Backnd Developr"},
+            headers=headers
+        )
+
+        data = resp.json()["data"]
+        self.assertEqual(data["jobs"], [{"title": "Backend Developer"}])
+        self.assertEqual(data["jobSuggestions"], ["Backend Developer"])
+
+    def test_recommended_jobs(self):
+        token = self.get_token_for("user@example.com", "userpass")
+
+        headers = {"Authorization": f"JWT {token}"}
+
+        profile = self.user.profile
+        profile.headline = "Django developer"
+        profile.save()
+
+        query = '''
+            query recommended {
+                recommendedJobs (limit: 5) {
+                    title
+                }
+            }
+        '''
+
+        resp = self.query(query, headers=headers)
+        self.assertEqual(resp.json()["data"]["recommendedJobs"], [{"title": "Backend Developer"}])
+
+    def test_similar_jobs(self):
+        token = self.get_token_for("user@example.com", "userpass")
+
+        headers = {"Authorization": f"JWT {token}"}
+
+        Job.objects.create(
+            title="Backend Developer", description="Work with Django", company="Other Co",
+            location="Remote", job_type="full-time", category=self.cat, posted_by=self.admin,
+        )
+
+        query = '''
+            query getJob ($id: UUID!) {
+                job (id: $id) {
+                    similarJobs {
+                        company
+                    }
+                }
+            }
+        '''
+
+        resp = self.query(query, variables={"id": str(self.job.id)}, headers=headers)
+        self.assertEqual(resp.json()["data"]["job"]["similarJobs"], [{"company": "Other Co"}])
+
     def test_get_job(self):
         token = self.get_token_for("user@example.com", "userpass")
 
@@ -245,6 +1074,15 @@ class TestGraphQLAPI(GraphQLTestCase):
         self.assertContains(resp, data['title'])
         self.assertContains(resp, data['company'])
 
+        # posting it again is rejected as a duplicate
+        resp = self.query(
+            query=query,
+            operation_name="createJob",
+            variables={"input": data},
+            headers=headers
+        )
+        self.assertIn("duplicates the open posting", resp.json()["errors"][0]["message"])
+
     def test_unauthorised_create_job(self):        
         # test unathorised user
         token = self.get_token_for("user@example.com", "userpass")
@@ -362,3 +1200,171 @@ class TestGraphQLAPI(GraphQLTestCase):
         self.assertEqual(data['data']['deleteJob'], {'success': True})
         
 
+
+
+class QueryPlanTest(APITestCase):
+    """
+    EXPLAIN the page queries the list endpoints actually run, on a seeded
+    dataset, and fail on sequential scans of the big tables or sorts the
+    indexes should have made unnecessary.
+
+    Seq scans and sorts are disabled for the EXPLAIN, so the planner only
+    falls back to them when no index can serve the query. That keeps the
+    plans independent of how small the test tables are.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        from applications.models import Application
+
+        cls.admin = User.objects.create_user(email="admin@example.com", password="adminpass", role="admin", is_staff=True)
+        cls.user = User.objects.create_user(email="user@example.com", password="userpass", role="user")
+        categories = [JobCategory.objects.create(name=f"Category {i}", slug=f"cat-{i}") for i in range(5)]
+        job_types = ["full-time", "part-time", "remote"]
+
+        # skewed like real data: the filters worth indexing are the selective ones
+        def job_type(i):
+            return "internship" if i % 50 == 0 else "contract" if i % 10 == 0 else job_types[i % 3]
+
+        def category(i):
+            return categories[0] if i % 50 == 1 else categories[1 + i % 4]
+
+        jobs = Job.objects.bulk_create([
+            Job(
+                title="Kubernetes Engineer" if i % 500 == 7 else f"Job {i}", description="Seeded",
+                company=f"Company {i % 40}", location="Remote",
+                job_type=job_type(i), category=category(i),
+                salary_min=None if i % 4 == 0 else 20000 + (i % 10) * 15000,
+                latitude=6.5 + (i % 50) / 100 if i % 3 == 0 else None,
+                longitude=3.3 + (i % 50) / 100 if i % 3 == 0 else None,
+                posted_by=cls.admin,
+                # a share of closed and expired postings the partial indexes skip
+                status="closed" if i % 5 == 2 else "expired" if i % 5 == 4 else "open",
+            )
+            for i in range(3000)
+        ])
+        applicants = [
+            User.objects.create_user(email=f"applicant{i}@example.com", password="pass", role="user")
+            for i in range(3)
+        ]
+        Application.objects.bulk_create(
+            [Application(job=job, applicant=cls.user, resume="resumes/seeded.pdf") for job in jobs[:20]]
+            + [
+                Application(job=job, applicant=applicant, resume="resumes/seeded.pdf")
+                for applicant in applicants for job in jobs[:500]
+            ]
+        )
+        cls.category = categories[0]
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE jobs_job")
+            cursor.execute("ANALYZE applications_application")
+
+    def setUp(self):
+        cache.clear()
+
+    def auth_headers(self, email, password):
+        resp = self.client.post(reverse("login"), {"email": email, "password": password}, format="json")
+        return {"HTTP_AUTHORIZATION": f"Bearer {resp.data['access']}"}
+
+    def plan_nodes(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cursor.fetchone()[0]
+            cursor.execute("RESET enable_seqscan")
+            cursor.execute("RESET enable_sort")
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        nodes, stack = [], [plan[0]["Plan"]]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(node.get("Plans", []))
+        return nodes
+
+    def assertIndexedPlan(self, sql, allow_sort=False, uses=()):
+        """
+        No seq scan of the big tables, no sort unless allowed, and when
+        `uses` is given, one of its columns / index names has to be an index
+        condition (not just a filter applied while walking another index).
+        """
+        nodes = self.plan_nodes(sql)
+        for node in nodes:
+            if node["Node Type"] == "Seq Scan":
+                self.assertNotIn(node["Relation Name"], ("jobs_job", "applications_application"), sql)
+            if not allow_sort:
+                self.assertNotIn(node["Node Type"], ("Sort", "Incremental Sort"), sql)
+        if uses:
+            conditions = " ".join(node.get("Index Cond", "") + " " + node.get("Index Name", "") for node in nodes)
+            self.assertTrue(any(name in conditions for name in uses), (uses, sql))
+
+    def page_queries(self, url, table, headers):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, **headers)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, url)
+        queries = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT") and f'FROM "{table}"' in q["sql"] and "LIMIT" in q["sql"]
+        ]
+        self.assertTrue(queries, url)
+        return queries
+
+    def test_job_list_plans(self):
+        headers = self.auth_headers("user@example.com", "userpass")
+        base = reverse("job-list") + "?count=false"
+        cases = [
+            (base, False, ()),
+            (base + "&job_type=internship", False, ("job_type",)),
+            (base + f"&category={self.category.pk}", False, ("category_id",)),
+            (base + f"&category={self.category.pk}&job_type=remote", False, ("category_id", "job_type")),
+            (base + "&salary_band=unspecified", False, ("jobs_job_no_salary_recent",)),
+            (base + "&pagination=cursor&job_type=internship", False, ("job_type",)),
+            (base + "&view=summary&job_type=internship", False, ("job_type",)),
+            # the box is an index range; distance ordering needs a sort
+            (base + "&near=6.6,3.4&radius_km=20&ordering=distance", True, ("latitude",)),
+            # ranked by relevance, so sorted; the match itself is a GIN lookup
+            (base + "&search=kubernetes", True, ("search_vector",)),
+            # everything, newest first, off the full (created_at, id) index
+            (base + "&status=all", False, ()),
+        ]
+        for url, allow_sort, uses in cases:
+            with self.subTest(url=url):
+                for sql in self.page_queries(url, "jobs_job", headers):
+                    self.assertIndexedPlan(sql, allow_sort=allow_sort, uses=uses)
+
+        # walking on from a cursor stays on the index too
+        resp = self.client.get(base + "&pagination=cursor&limit=10&job_type=internship", **headers)
+        for sql in self.page_queries(resp.data["next"], "jobs_job", headers):
+            self.assertIndexedPlan(sql, uses=("job_type",))
+
+    def test_application_list_plans(self):
+        # users only see their own applications
+        cases = (("user@example.com", "userpass", ("applicant_id",)), ("admin@example.com", "adminpass", ()))
+        for email, password, uses in cases:
+            headers = self.auth_headers(email, password)
+            for query in ("?count=false", "?pagination=cursor"):
+                with self.subTest(email=email, query=query):
+                    url = reverse("application-list") + query
+                    for sql in self.page_queries(url, "applications_application", headers):
+                        self.assertIndexedPlan(sql, uses=uses)
+
+    def test_graphql_jobs_plan(self):
+        resp = self.client.post("/graphql/", {
+            "query": 'mutation { tokenAuth(email: "user@example.com", password: "userpass") { token } }'
+        }, format="json")
+        token = resp.json()["data"]["tokenAuth"]["token"]
+
+        for query in ("{ jobs { id title } }", "{ jobsConnection(first: 50) { edges { node { id title } } } }"):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.post(
+                    "/graphql/", {"query": query}, format="json",
+                    HTTP_AUTHORIZATION=f"JWT {token}",
+                )
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            queries = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('SELECT') and 'FROM "jobs_job"' in q["sql"]]
+            self.assertTrue(queries)
+            for sql in queries:
+                self.assertIndexedPlan(sql)
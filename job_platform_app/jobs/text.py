@@ -0,0 +1,19 @@
+import re
+
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset("""
+    a about an and are as at be by for from has have in is it its of on or our
+    that the their this to we will with you your
+""".split())
+
+
+def tokens(text):
+    """
+    Lowercased words of `text` (keeping c++, c#), stop words dropped.
+
+    Job.fingerprint stores a hash of these, so changing the tokenizer
+    needs a migration recomputing every fingerprint (see 0011).
+    """
+    return [token for token in TOKEN_RE.findall((text or "").lower()) if token not in STOP_WORDS]
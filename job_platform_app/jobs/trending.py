@@ -0,0 +1,119 @@
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from applications.models import Application
+from common.cache import bump_generation
+
+from .models import Job, JobTrendingScore
+
+
+# scores are kept relative to this instant, see decay_offset()
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+# log(a + b) from log a and log b, without leaving log space
+_LOG_ADD = "GREATEST({a}, {b}) + LN(1 + EXP(-ABS({a} - {b})))"
+
+
+def decay_offset(when):
+    """
+    An event of weight w at `when` adds w * 2 ** (hours since EPOCH /
+    HALF_LIFE_HOURS) to a job's score. Growing the new weights instead of
+    shrinking the old ones means only jobs with new activity need writing,
+    and the order of the rows is the order of the decayed scores at any
+    moment. Stored as logs so it never overflows.
+    """
+    hours = (when - EPOCH).total_seconds() / 3600
+    return hours / settings.TRENDING["HALF_LIFE_HOURS"] * math.log(2)
+
+
+def _tables():
+    quote = connection.ops.quote_name
+    return quote(JobTrendingScore._meta.db_table), quote(Application._meta.db_table), quote(Job._meta.db_table)
+
+
+def record_views(cursor, items):
+    """
+    BufferedCounter hook: add flushed (job pk, views) to the pending views
+    of the rollup, skipping jobs deleted meanwhile.
+    """
+    scores, _, jobs = _tables()
+    values = ", ".join(["(%s::uuid, %s::bigint)"] * len(items))
+    cursor.execute(
+        f"INSERT INTO {scores} (job_id, log_score, pending_views) "
+        f"SELECT v.pk, '-Infinity', v.amount FROM (VALUES {values}) AS v(pk, amount) "
+        f"JOIN {jobs} ON {jobs}.id = v.pk "
+        f"ON CONFLICT (job_id) DO UPDATE SET pending_views = {scores}.pending_views + EXCLUDED.pending_views",
+        [value for item in items for value in item],
+    )
+
+
+def refresh_trending_scores(now=None):
+    """
+    Fold the applications created and the views flushed since the last
+    refresh into the scores, then drop rows that decayed below MIN_SCORE.
+    Returns (jobs updated, rows pruned).
+    """
+    options = settings.TRENDING
+    now = now or timezone.now()
+    offset = decay_offset(now)
+    scores, applications, _ = _tables()
+
+    with transaction.atomic():
+        since = JobTrendingScore.objects.aggregate(last=Max("refreshed_at"))["last"]
+        if since is None:
+            since = now - timedelta(hours=options["HALF_LIFE_HOURS"] * 3)
+
+        with connection.cursor() as cursor:
+            # consumed views are subtracted rather than reset, so views
+            # flushed while this runs stay pending for the next refresh
+            cursor.execute(
+                f"""
+                WITH applied AS (
+                    SELECT job_id, COUNT(*) AS n FROM {applications}
+                    WHERE created_at > %(since)s AND created_at <= %(now)s
+                    GROUP BY job_id
+                ),
+                viewed AS (
+                    SELECT job_id, pending_views FROM {scores} WHERE pending_views > 0
+                ),
+                activity AS (
+                    SELECT COALESCE(applied.job_id, viewed.job_id) AS job_id,
+                           COALESCE(viewed.pending_views, 0) AS views,
+                           COALESCE(applied.n, 0) * %(application_weight)s
+                           + COALESCE(viewed.pending_views, 0) * %(view_weight)s AS weight
+                    FROM applied FULL JOIN viewed ON viewed.job_id = applied.job_id
+                )
+                INSERT INTO {scores} (job_id, log_score, pending_views, refreshed_at)
+                SELECT job_id, LN(weight) + %(offset)s, -views, %(now)s FROM activity WHERE weight > 0
+                ON CONFLICT (job_id) DO UPDATE SET
+                    log_score = {_LOG_ADD.format(a=f"{scores}.log_score", b="EXCLUDED.log_score")},
+                    pending_views = {scores}.pending_views + EXCLUDED.pending_views,
+                    refreshed_at = EXCLUDED.refreshed_at
+                """,
+                {
+                    "since": since, "now": now, "offset": offset,
+                    "application_weight": options["APPLICATION_WEIGHT"], "view_weight": options["VIEW_WEIGHT"],
+                },
+            )
+            updated = cursor.rowcount
+
+        pruned, _ = JobTrendingScore.objects.filter(
+            log_score__lt=offset + math.log(options["MIN_SCORE"]), pending_views__lte=0,
+        ).delete()
+
+    if updated or pruned:
+        # cached trending pages and their ETags
+        bump_generation(JobTrendingScore)
+    return updated, pruned
+
+
+def order_by_trending(queryset):
+    """
+    Jobs with recent activity, hottest first.
+    """
+    return queryset.filter(trending__isnull=False).order_by("-trending__log_score", "-created_at", "-id")
@@ -2,7 +2,8 @@ from django.urls import path
 
 from .views import (
     JobCategoryListCreateView, JobCategoryDetailView,
-    JobListCreateView, JobDetailView
+    JobListCreateView, JobDetailView, JobFacetsView, JobImportView,
+    JobExportView, JobAutocompleteView, RecommendedJobsView, JobSimilarView,
 )
 
 
@@ -13,5 +14,11 @@ urlpatterns = [
 
     # jobs
     path("", JobListCreateView.as_view(), name="job-list"),
+    path("facets/", JobFacetsView.as_view(), name="job-facets"),
+    path("autocomplete/", JobAutocompleteView.as_view(), name="job-autocomplete"),
+    path("import/", JobImportView.as_view(), name="job-import"),
+    path("export/", JobExportView.as_view(), name="job-export"),
+    path("recommended/", RecommendedJobsView.as_view(), name="job-recommended"),
     path("<uuid:pk>/", JobDetailView.as_view(), name="job-detail"),
+    path("<uuid:pk>/similar/", JobSimilarView.as_view(), name="job-similar"),
 ]
@@ -1,15 +1,36 @@
-from rest_framework import generics, filters
-from common.permissions import IsAdminOrReadOnly
-
-from .models import Job, JobCategory
-from .serializers import JobSerializer, JobCategorySerializer
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from common.permissions import IsAdmin, IsAdminOrReadOnly
+from common.pagination import CursorOrLimitOffsetPagination
+from common.cache import CachedReadMixin
+from common.conditional import ConditionalGetMixin
+from common.serializers import load_only_serialized
+from common.fastpath import FastListMixin
+from common.exports import EXPORT_FORMATS, export_rows, streaming_export_response
+
+from .models import Job, JobCategory, JobTrendingScore, SearchTerm
+from .serializers import JobSerializer, JobCategorySerializer, JobSummarySerializer
+from .filters import JobOrderingFilter, JobSearchFilter, filter_jobs
+from .facets import job_facets
+from .search import suggest
+from .autocomplete import autocomplete
+from .importers import IMPORT_FORMATS, import_jobs, read_rows
+from .exports import JOB_EXPORT_COLUMNS, job_export_queryset
+from .recommendations import recommend_jobs
+from .similarity import similar_jobs
+from .duplicates import DuplicateJob, check_duplicate
+from .popularity import job_views
 # from .permissions import IsAdminOrReadOnly
 
 
-class JobCategoryListCreateView(generics.ListCreateAPIView):
+class JobCategoryListCreateView(CachedReadMixin, generics.ListCreateAPIView):
     queryset = JobCategory.objects.all()
     serializer_class = JobCategorySerializer
     permission_classes = [IsAdminOrReadOnly]
+    cache_models = (JobCategory,)
 
 
 class JobCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -18,34 +39,182 @@ class JobCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAdminOrReadOnly]
 
 
-class JobListCreateView(generics.ListCreateAPIView):
+class JobListCreateView(ConditionalGetMixin, CachedReadMixin, FastListMixin, generics.ListCreateAPIView):
     serializer_class = JobSerializer
     permission_classes = [IsAdminOrReadOnly]
+    pagination_class = CursorOrLimitOffsetPagination
+    # trending scores only change the order of ?ordering=trending pages
+    cache_models = (Job, JobCategory, JobTrendingScore)
+    etag_models = (JobCategory, JobTrendingScore)
+    # keyset position for cursor pages
+    fast_path_columns = ("created_at",)
+
+    # full-text search over title, company, category and description
+    filter_backends = [JobSearchFilter, JobOrderingFilter]
 
-    # DRF native search
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["title", "company"]
+    def get_serializer_class(self):
+        if self.request.method == "GET" and self.request.query_params.get("view") == "summary":
+            return JobSummarySerializer
+        return JobSerializer
 
     def get_queryset(self):
-        queryset = Job.objects.select_related("category", "posted_by")
+        # load only the columns the (possibly trimmed) serializer reads;
+        # created_at is the keyset pagination position
+        queryset = load_only_serialized(Job.objects.all(), self.get_serializer(), extra=["created_at"])
+
+        # Manual filters (job_type, category, salary_band, near/radius_km)
+        return filter_jobs(queryset, self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+
+        # "did you mean" hints for fuzzy searches
+        term = request.query_params.get("search", "").strip()
+        if term and request.query_params.get("search_mode") == "fuzzy":
+            response.data["suggestions"] = suggest(term)
+        return response
+
+    def create(self, request, *args, **kwargs):
+        self.merged_into = None
+        response = super().create(request, *args, **kwargs)
+        if self.merged_into is not None:
+            # re-posted an open job, which was renewed instead
+            response.status_code = status.HTTP_200_OK
+        return response
 
-        # Manual filters
-        job_type = self.request.query_params.get("job_type")
-        category = self.request.query_params.get("category")
+    def perform_create(self, serializer):
+        try:
+            self.merged_into = check_duplicate(serializer.validated_data)
+        except DuplicateJob as exc:
+            raise ValidationError({"non_field_errors": [str(exc)], "duplicate_of": str(exc.duplicate.pk)})
+        if self.merged_into is not None:
+            serializer.instance = self.merged_into
+            return
+        serializer.save(posted_by=self.request.user)
 
-        if job_type:
-            queryset = queryset.filter(job_type=job_type)
 
-        if category:
-            queryset = queryset.filter(category_id=category)
+class JobFacetsView(CachedReadMixin, generics.RetrieveAPIView):
+    """
+    Facet counts for the same search and filters as the job list.
+    """
+    permission_classes = [IsAdminOrReadOnly]
+    cache_models = (Job, JobCategory)
+    filter_backends = [JobSearchFilter]
 
-        return queryset
+    def get_queryset(self):
+        return filter_jobs(Job.objects.all(), self.request.query_params)
+
+    # retrieve rather than get, so CachedReadMixin.get wraps it
+    def retrieve(self, request, *args, **kwargs):
+        return Response(job_facets(self.filter_queryset(self.get_queryset())))
+
+
+class JobAutocompleteView(generics.GenericAPIView):
+    """
+    Typeahead: the most popular titles, companies and cities starting with `q`.
+    """
+    permission_classes = [IsAdminOrReadOnly]
+
+    def get(self, request, *args, **kwargs):
+        kinds = [kind for kind in request.query_params.get("kind", "").split(",") if kind]
+        valid_kinds = {kind for kind, _ in SearchTerm.KIND_CHOICES}
+        if not valid_kinds.issuperset(kinds):
+            raise ValidationError({"kind": [f"Expected any of {', '.join(sorted(valid_kinds))}."]})
+        try:
+            limit = int(request.query_params.get("limit", 0)) or None
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+
+        return Response({"results": autocomplete(request.query_params.get("q", ""), kinds, limit)})
 
-    def perform_create(self, serializer):
-        serializer.save(posted_by=self.request.user)
 
+class RecommendedJobsView(generics.GenericAPIView):
+    """
+    Active jobs ranked against the logged-in user's profile.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = JobSummarySerializer
 
-class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Job.objects.select_related("category", "posted_by")
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get("limit", 0)) or None
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+
+        results = recommend_jobs(request.user.profile, limit)
+        data = self.get_serializer([job for job, _ in results], many=True).data
+        for item, (_, score) in zip(data, results):
+            item["score"] = round(score, 4)
+        return Response({"results": data})
+
+
+class JobImportView(generics.GenericAPIView):
+    """
+    Bulk import jobs from an uploaded CSV or JSONL `file` (admin only).
+    """
+    permission_classes = [IsAdmin]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["No file was submitted."]})
+
+        fmt = request.data.get("format") or upload.name.rsplit(".", 1)[-1].lower()
+        if fmt not in IMPORT_FORMATS:
+            raise ValidationError({"format": [f"Expected one of {', '.join(IMPORT_FORMATS)}."]})
+
+        result = import_jobs(read_rows(upload, fmt), request.user)
+        return Response(result.as_dict(), status=status.HTTP_200_OK)
+
+
+class JobExportView(generics.GenericAPIView):
+    """
+    Stream every job as CSV or JSONL (`?export_format=`, admin only).
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request, *args, **kwargs):
+        fmt = request.query_params.get("export_format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({"export_format": [f"Expected one of {', '.join(EXPORT_FORMATS)}."]})
+
+        rows = export_rows(job_export_queryset(), JOB_EXPORT_COLUMNS)
+        return streaming_export_response(fmt, "jobs", list(JOB_EXPORT_COLUMNS), rows)
+
+
+class JobDetailView(ConditionalGetMixin, CachedReadMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Job.objects.select_related("category").defer("search_vector")
     serializer_class = JobSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cache_models = (Job, JobCategory)
+    etag_models = (JobCategory,)
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        # counted in memory, cache hits and 304s included
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            job_views.incr(kwargs["pk"])
+        return response
+
+
+class JobSimilarView(CachedReadMixin, generics.RetrieveAPIView):
+    """
+    Active jobs with a similar title and description, from the LSH index.
+    """
+    queryset = Job.objects.only("id")
+    serializer_class = JobSummarySerializer
+    permission_classes = [IsAdminOrReadOnly]
+    cache_models = (Job,)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get("limit", 0)) or None
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+
+        results = similar_jobs(self.get_object(), limit)
+        data = self.get_serializer([job for job, _ in results], many=True).data
+        for item, (_, similarity) in zip(data, results):
+            item["similarity"] = round(similarity, 4)
+        return Response({"results": data})
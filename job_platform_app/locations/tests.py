@@ -37,3 +37,19 @@ class LocationsAPITest(APITestCase):
         headers = self.auth_headers("user@example.com", "userpass")
         resp = self.client.post(c_url, {"name": "Nowhere"}, format="json", **headers)
         self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_conditional_get(self):
+        country = Country.objects.create(name="Narnia")
+        detail = reverse("country-detail", kwargs={"pk": str(country.id)})
+
+        etag = self.client.get(detail)["ETag"]
+        resp = self.client.get(detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        list_url = reverse("country-list")
+        list_etag = self.client.get(list_url)["ETag"]
+        country.name = "Archenland"
+        country.save()
+        resp = self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["results"][0]["name"], "Archenland")
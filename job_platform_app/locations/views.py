@@ -1,14 +1,18 @@
 from rest_framework import generics
 from rest_framework.permissions import AllowAny
 from common.permissions import IsAdmin
+from common.conditional import ConditionalGetMixin
+from common.fastpath import FastListMixin
 
 from .models import Country, State, City
 from .serializers import CountrySerializer, StateSerializer, CitySerializer
 
 
-class CountryListCreateView(generics.ListCreateAPIView):
+class CountryListCreateView(ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
+    # cached list counts and validators
+    cache_models = (Country,)
 
     def get_permissions(self):
         if self.request.method == "POST":
@@ -16,7 +20,7 @@ class CountryListCreateView(generics.ListCreateAPIView):
         return [AllowAny()]
     
 
-class CountryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CountryDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
 
@@ -26,9 +30,11 @@ class CountryDetailView(generics.RetrieveUpdateDestroyAPIView):
         return [AllowAny()]
 
 
-class StateListCreateView(generics.ListCreateAPIView):
+class StateListCreateView(ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
     queryset = State.objects.all()
     serializer_class = StateSerializer
+    # cached list counts and validators
+    cache_models = (State,)
 
     def get_permissions(self):
         if self.request.method == "POST":
@@ -36,7 +42,7 @@ class StateListCreateView(generics.ListCreateAPIView):
         return [AllowAny()]
 
 
-class StateDetailView(generics.RetrieveUpdateDestroyAPIView):
+class StateDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = State.objects.all()
     serializer_class = StateSerializer
 
@@ -46,9 +52,11 @@ class StateDetailView(generics.RetrieveUpdateDestroyAPIView):
         return [AllowAny()]
 
 
-class CityListCreateView(generics.ListCreateAPIView):
+class CityListCreateView(ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
     queryset = City.objects.all()
     serializer_class = CitySerializer
+    # cached list counts and validators
+    cache_models = (City,)
 
     def get_permissions(self):
         if self.request.method == "POST":
@@ -56,7 +64,7 @@ class CityListCreateView(generics.ListCreateAPIView):
         return [AllowAny()]
 
 
-class CityDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CityDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = City.objects.all()
     serializer_class = CitySerializer
 
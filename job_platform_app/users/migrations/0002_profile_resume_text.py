@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='resume_text',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
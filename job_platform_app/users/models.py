@@ -30,6 +30,12 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     objects = UserManager()
 
+    class Meta:
+        indexes = [
+            # keyset pagination walks (created_at, id)
+            models.Index(fields=["created_at", "id"]),
+        ]
+
     def __str__(self):
         return self.email
     
@@ -48,6 +54,8 @@ class Profile(models.Model):
     location = models.UUIDField(null=True, blank=True)  # TODO: will link later
 
     resume_url = models.TextField(null=True, blank=True)
+    # plain text of the resume, used for job recommendations
+    resume_text = models.TextField(null=True, blank=True)
 
     skill = models.UUIDField(null=True, blank=True)  # TODO: will link later
 
@@ -1,6 +1,9 @@
 import graphene
-from graphene_django import DjangoObjectType
+from graphene_django import bypass_get_queryset
 from django.contrib.auth import get_user_model
+from common.connections import keyset_connection
+from common.loaders import load_related
+from common.optimizer import OptimizedDjangoObjectType
 
 from .models import Profile
 
@@ -8,20 +11,30 @@ from .models import Profile
 User = get_user_model()
 
 
-class ProfileType(DjangoObjectType):
+class ProfileType(OptimizedDjangoObjectType):
     class Meta:
         model = Profile
         fields = ("id", "fullname", "headline", "bio", "phone_number", "location", "resume_url", "skill", "visibility")
 
 
-class UserType(DjangoObjectType):
+class UserType(OptimizedDjangoObjectType):
     class Meta:
         model = User
         fields = ("id", "email", "profile", "role", "date_joined")
 
+    @bypass_get_queryset
+    def resolve_profile(self, info):
+        return load_related(info, self, "profile")
+
+
+class UserConnection(graphene.relay.Connection):
+    class Meta:
+        node = UserType
+
 
 class UserQuery(graphene.ObjectType):
-    users = graphene.List(UserType)
+    users = graphene.List(UserType, deprecation_reason="Unbounded, use usersConnection.")
+    users_connection = graphene.Field(UserConnection, first=graphene.Int(), after=graphene.String())
     user = graphene.Field(UserType, id=graphene.UUID(required=True))
 
     def resolve_users(root, info):
@@ -31,14 +44,20 @@ class UserQuery(graphene.ObjectType):
         if user.is_anonymous:
             raise Exception("User not logged in!")
         
-        return User.objects.all()
+        return UserType.get_queryset(User.objects.all(), info)
+
+    def resolve_users_connection(root, info, first=None, after=None):
+        user = info.context.user
+        if user.is_anonymous:
+            raise Exception("User not logged in!")
+        return keyset_connection(UserConnection, User.objects.all(), info, first, after)
 
     def resolve_user(root, info, id):
         user = info.context.user
         if user.is_anonymous:
             raise Exception("User not logged in!")
         
-        return User.objects.get(pk=id)
+        return UserType.get_queryset(User.objects.all(), info).get(pk=id)
     
 
 
@@ -160,6 +160,15 @@ class TestGraphQLAPI(GraphQLTestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertContains(resp, 'profile')
 
+    def test_resume_text_is_not_exposed(self):
+        token = self.get_token_for("user@example.com", "userpass")
+        resp = self.query(
+            query="{ users { profile { resumeText } } }",
+            headers={"Authorization": f"JWT {token}"},
+        )
+        self.assertResponseHasErrors(resp)
+        self.assertIn("resumeText", resp.json()["errors"][0]["message"])
+
     def test_unauthorised_user(self):
         query = '''
             query getUsers {